@@ -23,12 +23,9 @@ if config.config_file_name is not None:
 
 from src.models import Base
 
-from src.article.models import Article, ArticleImage, ArticleCategory, Tag
-from src.user.models import User, UserRoles, Role, RefreshToken
-from src.redirect.models import Redirect
-from src.periode.models import Periode
-from src.infographic.models import Infographic
-from src.babyname.models import BabyName
+from src.customer.models import Customer
+from src.order.models import Order, OrderItem
+from src.product.models import Category, Product
 target_metadata = Base.metadata
 
 
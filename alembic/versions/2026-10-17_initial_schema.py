@@ -0,0 +1,44 @@
+"""initial schema
+
+The categories and products tables as they existed before migrations were
+introduced. A database that already has them, e.g. one created with
+``Base.metadata.create_all`` from that code, is brought under Alembic with
+``alembic stamp 1a7e3c5b9d20`` followed by ``alembic upgrade head``.
+
+Revision ID: 1a7e3c5b9d20
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '1a7e3c5b9d20'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("description", sa.String()),
+    )
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("session_id", sa.UUID()),
+        sa.Column("name", sa.String(255)),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id")),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("is_active", sa.Boolean()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("products")
+    op.drop_table("categories")
@@ -0,0 +1,66 @@
+"""orders
+
+Creates customers, orders and order_items. Customer PII columns hold Fernet
+tokens (EncryptedString), so they are unbounded VARCHARs; order statuses and
+payment methods are stored as their enum values in VARCHAR(20).
+
+Revision ID: 8d2b6f0c4a19
+Revises: 5c3f9a1e7b42
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '8d2b6f0c4a19'
+down_revision = '5c3f9a1e7b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "customers",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("first_name", sa.String(100), nullable=False),
+        sa.Column("last_name", sa.String(100), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("address", sa.String()),
+    )
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("order_number", sa.String(64), nullable=False, unique=True),
+        sa.Column("customer_id", sa.Integer(), sa.ForeignKey("customers.id")),
+        sa.Column("order_date", sa.DateTime(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("payment_method", sa.String(20), nullable=False),
+        sa.Column("total_amount", sa.DECIMAL(12, 2), nullable=False),
+        sa.Column("note", sa.String(500)),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_orders_status_order_date", "orders", ["status", "order_date"])
+    op.create_table(
+        "order_items",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "order_id",
+            sa.Integer(),
+            sa.ForeignKey("orders.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("product_id", sa.String(64), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("price_per_unit", sa.DECIMAL(10, 2), nullable=False),
+    )
+    op.create_index("ix_order_items_order_id", "order_items", ["order_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_items_order_id", table_name="order_items")
+    op.drop_table("order_items")
+    op.drop_index("ix_orders_status_order_date", table_name="orders")
+    op.drop_table("orders")
+    op.drop_table("customers")
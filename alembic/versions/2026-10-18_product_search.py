@@ -0,0 +1,95 @@
+"""product search
+
+Adds the ProductRequest columns to products, a generated tsvector column
+and the GIN indexes behind Product.search. The indexes are built
+CONCURRENTLY, outside the migration transaction, so the table stays
+writable; adding the stored generated column still rewrites the table once.
+
+Revision ID: 5c3f9a1e7b42
+Revises: 1a7e3c5b9d20
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5c3f9a1e7b42'
+down_revision = '1a7e3c5b9d20'
+branch_labels = None
+depends_on = None
+
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(brand, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column("products", sa.Column("description", sa.Text()))
+    op.add_column("products", sa.Column("price", sa.DECIMAL(10, 2)))
+    op.add_column("products", sa.Column("stock", sa.Integer()))
+    op.add_column("products", sa.Column("image", sa.String(2048)))
+    op.add_column("products", sa.Column("ratings", sa.Float()))
+    op.add_column("products", sa.Column("discount", sa.Float()))
+    op.add_column("products", sa.Column("manufacturer", sa.String(255)))
+    op.add_column("products", sa.Column("brand", sa.String(255)))
+    op.add_column(
+        "products",
+        sa.Column("tags", postgresql.ARRAY(sa.String(100)), nullable=False, server_default="{}"),
+    )
+    op.add_column(
+        "products",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_DOCUMENT, persisted=True)),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_search_vector",
+            "products",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_products_name_trgm",
+            "products",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_products_tags",
+            "products",
+            ["tags"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in ("ix_products_tags", "ix_products_name_trgm", "ix_products_search_vector"):
+            op.drop_index(name, table_name="products", postgresql_concurrently=True, if_exists=True)
+
+    for column in (
+        "search_vector",
+        "tags",
+        "brand",
+        "manufacturer",
+        "discount",
+        "ratings",
+        "image",
+        "stock",
+        "price",
+        "description",
+    ):
+        op.drop_column("products", column)
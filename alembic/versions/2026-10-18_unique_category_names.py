@@ -0,0 +1,43 @@
+"""unique category names
+
+Makes categories.name unique, so Category.ids_by_name can create missing
+categories with INSERT ... ON CONFLICT (name) DO NOTHING. Duplicate names
+left behind by concurrent imports are merged into their oldest row first.
+
+Revision ID: 3f6b8d2a1c57
+Revises: 8d2b6f0c4a19
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3f6b8d2a1c57'
+down_revision = '8d2b6f0c4a19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE products SET category_id = keep.id
+        FROM categories duplicate
+        JOIN (SELECT name, min(id) AS id FROM categories GROUP BY name) keep
+            ON keep.name = duplicate.name AND keep.id <> duplicate.id
+        WHERE products.category_id = duplicate.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM categories duplicate
+        USING categories keep
+        WHERE keep.name = duplicate.name AND keep.id < duplicate.id
+        """
+    )
+    op.create_unique_constraint("categories_name_key", "categories", ["name"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("categories_name_key", "categories", type_="unique")
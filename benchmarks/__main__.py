@@ -0,0 +1,53 @@
+import argparse
+import json
+import logging
+import sys
+
+from benchmarks import bench_asgi, bench_queries, bench_schemas, bench_startup  # noqa: F401 registers benchmarks
+from benchmarks.harness import BENCHMARKS, compare, load, over_budget, run
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run benchmarks")
+    run_parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this")
+    run_parser.add_argument("--rounds", type=int, default=20)
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--output", help="write results as JSON to this file")
+    run_parser.add_argument("--compare", help="baseline JSON to compare against")
+    run_parser.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown, 0.10 = 10%%")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    commands.add_parser("list", help="list benchmarks")
+
+    args = parser.parse_args()
+    # Per-request INFO logging would dominate the ASGI timings.
+    logging.disable(logging.INFO)
+
+    if args.command == "list":
+        for bench in BENCHMARKS.values():
+            print(f"{bench.group:<14} {bench.name}")
+        return 0
+
+    if args.command == "compare":
+        return 1 if compare(load(args.baseline), load(args.current), args.threshold) else 0
+
+    selected = [b for b in BENCHMARKS.values() if args.pattern in b.name]
+    results = run(selected, args.rounds, args.warmup)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    failed = over_budget(results)
+    if args.compare:
+        failed += compare(load(args.compare), results, args.threshold)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import httpx
+
+from benchmarks import fixtures
+from benchmarks.harness import benchmark
+
+REQUESTS_PER_ROUND = 100
+
+
+def _client() -> httpx.AsyncClient:
+    from src.main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+
+def _post_all(path: str, payloads: list[dict]):
+    client = _client()
+
+    async def _run():
+        for payload in payloads:
+            response = await client.post(path, json=payload)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} returned {response.status_code}: {response.text}")
+
+    return _run
+
+
+@benchmark("asgi")
+def asgi_create_product():
+    return _post_all("/product", fixtures.product_payloads()[:REQUESTS_PER_ROUND])
+
+
+@benchmark("asgi")
+def asgi_create_payment():
+    return _post_all("/payment/card", fixtures.payment_payloads()[:REQUESTS_PER_ROUND])
@@ -0,0 +1,79 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks import fixtures
+from benchmarks.harness import benchmark
+from src.cache import query_key, statement_key
+from src.product.models import Product
+
+# Cache key CPU work per find-by-id, then the full lookups against SQLite
+# with the cache off: Product.find builds its statement on every call,
+# Product.get executes the pre-built "product_by_id" query.
+
+
+@benchmark("queries")
+def cache_key_statement():
+    ids = range(fixtures.SIZE)
+
+    def _run():
+        for product_id in ids:
+            statement_key(Product.__tablename__, select(Product).where(Product.id == product_id))
+
+    return _run
+
+
+@benchmark("queries")
+def cache_key_named_query():
+    ids = range(fixtures.SIZE)
+    return lambda: [query_key("product_by_id", id=product_id) for product_id in ids]
+
+
+@benchmark("queries")
+def find_by_id_compile_uncached():
+    dialect = asyncpg_dialect()
+    ids = range(fixtures.SIZE)
+    return lambda: [select(Product).where(Product.id == i).compile(dialect=dialect) for i in ids]
+
+
+def _sqlite_products() -> async_sessionmaker:
+    """A SQLite file holding ``fixtures.SIZE`` products, with the columns Product selects."""
+    path = Path(tempfile.mkdtemp()) / "products.db"
+    with sqlite3.connect(path) as conn:
+        columns = ", ".join(c.name for c in Product.__table__.columns if c.name not in ("id", "search_vector"))
+        conn.execute(f"CREATE TABLE products (id INTEGER PRIMARY KEY, {columns})")
+        conn.executemany(
+            "INSERT INTO products (id, name, price, tags) VALUES (?, ?, ?, '{}')",
+            [(i, p["name"], p["price"]) for i, p in enumerate(fixtures.product_payloads())],
+        )
+    return async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False)
+
+
+@benchmark("queries")
+def find_by_id_execute():
+    session_factory = _sqlite_products()
+    ids = range(fixtures.SIZE)
+
+    async def _run():
+        async with session_factory() as db:
+            for product_id in ids:
+                await Product.find(db, [Product.id == product_id])
+
+    return _run
+
+
+@benchmark("queries")
+def get_by_id_execute():
+    session_factory = _sqlite_products()
+    ids = range(fixtures.SIZE)
+
+    async def _run():
+        async with session_factory() as db:
+            for product_id in ids:
+                await Product.get(db, product_id)
+
+    return _run
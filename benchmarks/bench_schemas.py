@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from benchmarks import fixtures
+from benchmarks.harness import benchmark
+from src.order.schema import Order
+from src.payment.schema import PaymentRequest
+from src.product.models import Product
+from src.product.schemas import ProductRecord, ProductRequest
+
+
+@benchmark("validation")
+def validate_product_request():
+    payloads = fixtures.product_payloads()
+    return lambda: [ProductRequest.model_validate(p) for p in payloads]
+
+
+@benchmark("validation")
+def validate_payment_request():
+    payloads = fixtures.payment_payloads()
+    return lambda: [PaymentRequest.model_validate(p) for p in payloads]
+
+
+@benchmark("validation")
+def validate_order():
+    payloads = fixtures.order_payloads()
+    return lambda: [Order.model_validate(p) for p in payloads]
+
+
+@benchmark("serialization")
+def serialize_product_request():
+    models = [ProductRequest.model_validate(p) for p in fixtures.product_payloads()]
+    return lambda: [m.model_dump_json() for m in models]
+
+
+@benchmark("serialization")
+def serialize_payment_request():
+    models = [PaymentRequest.model_validate(p) for p in fixtures.payment_payloads()]
+    return lambda: [m.model_dump_json() for m in models]
+
+
+@benchmark("serialization")
+def serialize_order():
+    models = [Order.model_validate(p) for p in fixtures.order_payloads()]
+    return lambda: [m.model_dump_json() for m in models]
+
+
+@benchmark("orm")
+def map_product_request_to_orm():
+    requests = [ProductRequest.model_validate(p) for p in fixtures.product_payloads()]
+    now = datetime(2024, 1, 1)
+
+    def _map():
+        return [
+            Product(
+                name=r.name,
+                description=r.description,
+                price=r.price,
+                brand=r.brand,
+                tags=r.tags,
+                is_active=r.availability,
+                created_at=now,
+                updated_at=now,
+            )
+            for r in requests
+        ]
+
+    return _map
+
+
+@benchmark("orm")
+def map_orm_to_product_record():
+    now = datetime(2024, 1, 1)
+    products = [
+        Product(
+            id=i,
+            name=p["name"],
+            description=p["description"],
+            price=p["price"],
+            brand=p.get("brand"),
+            tags=p.get("tags", []),
+            is_active=p["availability"],
+            created_at=now,
+            updated_at=now,
+        )
+        for i, p in enumerate(fixtures.product_payloads())
+    ]
+    return lambda: [ProductRecord.model_validate(p) for p in products]
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.harness import benchmark
+
+# Cold start of one worker: a fresh interpreter importing the app and
+# building the FastAPI instance, before the lifespan runs. Seconds; override
+# with COLD_START_BUDGET on slower CI machines.
+COLD_START_BUDGET = float(os.environ.get("COLD_START_BUDGET", 1.75))
+
+
+def _cold_import(module: str):
+    command = [sys.executable, "-c", f"import {module}"]
+
+    def _run():
+        subprocess.run(command, check=True, capture_output=True)
+
+    return _run
+
+
+@benchmark("startup", budget=COLD_START_BUDGET)
+def cold_start_app():
+    return _cold_import("src.main")
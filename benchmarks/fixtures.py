@@ -0,0 +1,103 @@
+import random
+import string
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any
+
+SEED = 20241021
+SIZE = 1000
+
+CATEGORIES = ["Electronics", "Clothing", "Books", "Toys", "Furniture"]
+CARD_PREFIXES = ["4", "51", "52", "53", "54", "55"]
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(count)
+    )
+
+
+def _luhn_complete(prefix: str, length: int, rng: random.Random) -> str:
+    digits = prefix + "".join(rng.choices(string.digits, k=length - len(prefix) - 1))
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        n = int(d)
+        if i % 2 == 0:
+            n *= 2
+            if n > 9:
+                n -= 9
+        total += n
+    return digits + str((10 - total % 10) % 10)
+
+
+@lru_cache
+def product_payloads(n: int = SIZE) -> list[dict[str, Any]]:
+    rng = random.Random(SEED)
+    return [
+        {
+            "name": _words(rng, 2),
+            "description": _words(rng, 30),
+            "price": round(rng.uniform(5.0, 500.0), 2),
+            "category": rng.choice(CATEGORIES),
+            "stock": rng.randint(0, 1000),
+            "availability": rng.random() > 0.1,
+            "image": f"https://example.com/images/{i}.jpg",
+            "ratings": round(rng.uniform(0, 5), 1),
+            "discount": round(rng.uniform(0, 50), 1),
+            "manufacturer": _words(rng, 1),
+            "brand": _words(rng, 1),
+            "tags": [_words(rng, 1) for _ in range(rng.randint(0, 5))],
+        }
+        for i in range(n)
+    ]
+
+
+@lru_cache
+def payment_payloads(n: int = SIZE) -> list[dict[str, Any]]:
+    rng = random.Random(SEED)
+    return [
+        {
+            "card_number": _luhn_complete(rng.choice(CARD_PREFIXES), 16, rng),
+            "expiration_date": f"{rng.randint(1, 12):02d}/{rng.randint(25, 35)}",
+            "cvv": f"{rng.randint(0, 999):03d}",
+            "cardholder_name": _words(rng, 2).title(),
+            "amount": round(rng.uniform(1.0, 1000.0), 2),
+        }
+        for _ in range(n)
+    ]
+
+
+@lru_cache
+def order_payloads(n: int = SIZE) -> list[dict[str, Any]]:
+    rng = random.Random(SEED)
+    start = datetime(2024, 1, 1)
+    orders = []
+    for i in range(n):
+        products = [
+            {
+                "product_id": f"P{rng.randint(1, 10_000)}",
+                "name": _words(rng, 2),
+                "quantity": rng.randint(1, 5),
+                "price_per_unit": f"{rng.uniform(1, 200):.2f}",
+            }
+            for _ in range(rng.randint(1, 8))
+        ]
+        orders.append(
+            {
+                "order_id": f"O{i}",
+                "customer": {
+                    "name": _words(rng, 2).title(),
+                    "email": f"customer{i}@example.com",
+                    "phone_number": f"+65{rng.randint(10_000_000, 99_999_999)}00",
+                    "shipping_address": _words(rng, 6),
+                },
+                "products": products,
+                "order_date": (start + timedelta(minutes=i)).isoformat(),
+                "status": "Pending",
+                "payment_method": "Credit Card",
+                "total_amount": "0.00",
+                "shipment": None,
+                "note": None,
+            }
+        )
+    return orders
@@ -0,0 +1,141 @@
+import asyncio
+import gc
+import inspect
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from importlib import metadata
+from typing import Any, Callable, Optional
+
+from benchmarks import fixtures
+
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    factory: Callable[[], Callable[[], Any]]
+    # Upper bound in seconds for the median, checked on every run.
+    budget: Optional[float] = None
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(group: str, budget: Optional[float] = None):
+    """
+    Register a benchmark factory.
+
+    The factory does all setup and returns the zero-argument callable (sync or
+    async) that is timed, so fixture generation never shows up in the numbers.
+    With a ``budget`` in seconds, a run fails if the median exceeds it.
+    """
+
+    def decorator(factory):
+        BENCHMARKS[factory.__name__] = Benchmark(factory.__name__, group, factory, budget)
+        return factory
+
+    return decorator
+
+
+def _versions() -> dict[str, str]:
+    versions = {"python": platform.python_version()}
+    for package in ("pydantic", "pydantic-core", "fastapi", "starlette", "sqlalchemy"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            pass
+    return versions
+
+
+def run_benchmark(bench: Benchmark, rounds: int, warmup: int) -> dict[str, Any]:
+    target = bench.factory()
+    if inspect.iscoroutinefunction(target):
+        loop = asyncio.new_event_loop()
+        call = lambda: loop.run_until_complete(target())  # noqa: E731
+    else:
+        loop = None
+        call = target
+
+    try:
+        for _ in range(warmup):
+            call()
+
+        timings = []
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                started = time.perf_counter()
+                call()
+                timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    finally:
+        if loop is not None:
+            loop.close()
+
+    return {
+        "group": bench.group,
+        "budget": bench.budget,
+        "rounds": rounds,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def run(selected: list[Benchmark], rounds: int, warmup: int) -> dict[str, Any]:
+    results = {}
+    for bench in selected:
+        results[bench.name] = run_benchmark(bench, rounds, warmup)
+        print(
+            f"{bench.group:<14} {bench.name:<40} "
+            f"median {results[bench.name]['median'] * 1000:9.3f} ms  "
+            f"min {results[bench.name]['min'] * 1000:9.3f} ms"
+        )
+    return {
+        "meta": {
+            "versions": _versions(),
+            "platform": platform.platform(),
+            "seed": fixtures.SEED,
+            "size": fixtures.SIZE,
+            "rounds": rounds,
+            "warmup": warmup,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[str]:
+    """Print the median ratio per benchmark and return the names that regressed."""
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            print(f"{name:<40} new")
+            continue
+        ratio = result["median"] / base["median"]
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:<40} {ratio:6.3f}x {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def over_budget(results: dict[str, Any]) -> list[str]:
+    """Print and return the benchmarks whose median exceeded their budget."""
+    exceeded = []
+    for name, result in results["benchmarks"].items():
+        if result.get("budget") is not None and result["median"] > result["budget"]:
+            print(f"{name:<40} median {result['median'] * 1000:.1f} ms over budget {result['budget'] * 1000:.0f} ms")
+            exceeded.append(name)
+    return exceeded
+
+
+def load(path: str) -> dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
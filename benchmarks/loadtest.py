@@ -0,0 +1,251 @@
+"""
+Load generator that replays recorded traffic or a synthetic request mix.
+
+Examples::
+
+    # closed loop, 50 concurrent users ramped up over 10s, in-process ASGI
+    python -m benchmarks.loadtest --mix product=5,payment=3,healthcheck=2 \
+        --concurrency 50 --ramp-up 10 --duration 60
+
+    # open loop at 500 req/s against 4 spawned uvicorn workers
+    python -m benchmarks.loadtest --replay traffic.jsonl --rate 500 --workers 4
+
+Replay files hold one request per line:
+``{"method": "POST", "path": "/product", "json": {...}, "headers": {...}}``.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+import httpx
+
+import benchmarks  # noqa: F401 sets the benchmark environment
+from benchmarks import fixtures
+
+SYNTHETIC = {
+    "product": lambda i: {"method": "POST", "path": "/product", "json": _cycle(fixtures.product_payloads(), i)},
+    "payment": lambda i: {"method": "POST", "path": "/payment/card", "json": _cycle(fixtures.payment_payloads(), i)},
+    "healthcheck": lambda i: {"method": "GET", "path": "/healthcheck"},
+}
+
+
+def _cycle(items: list[Any], i: int) -> Any:
+    return items[i % len(items)]
+
+
+@dataclass
+class Results:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    started: float = 0.0
+    finished: float = 0.0
+
+    def record(self, path: str, latency: float, ok: bool) -> None:
+        self.latencies[path].append(latency)
+        if not ok:
+            self.errors[path] += 1
+
+    def report(self) -> dict[str, Any]:
+        elapsed = self.finished - self.started
+        everything = [latency for values in self.latencies.values() for latency in values]
+        return {
+            "duration": elapsed,
+            "total": _summary(everything, sum(self.errors.values()), elapsed),
+            "endpoints": {
+                path: _summary(values, self.errors[path], elapsed)
+                for path, values in sorted(self.latencies.items())
+            },
+        }
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+def _summary(latencies: list[float], errors: int, elapsed: float) -> dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "throughput": len(ordered) / elapsed if elapsed else 0.0,
+        "error_rate": errors / len(ordered) if ordered else 0.0,
+        **{f"p{label}": _percentile(ordered, q) * 1000 for label, q in
+           (("50", 0.50), ("95", 0.95), ("99", 0.99), ("999", 0.999))},
+        "max": (ordered[-1] if ordered else 0.0) * 1000,
+    }
+
+
+def replay_source(path: str) -> Iterator[dict[str, Any]]:
+    with open(path) as f:
+        recorded = [json.loads(line) for line in f if line.strip()]
+    if not recorded:
+        raise SystemExit(f"{path} contains no requests")
+    return itertools.cycle(recorded)
+
+
+def synthetic_source(mix: str, seed: int) -> Iterator[dict[str, Any]]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SYNTHETIC:
+            raise SystemExit(f"Unknown endpoint {name!r}, expected one of {sorted(SYNTHETIC)}")
+        weights[name] = float(weight or 1)
+    rng = random.Random(seed)
+    names, cumulative = list(weights), list(itertools.accumulate(weights.values()))
+    for i in itertools.count():
+        yield SYNTHETIC[rng.choices(names, cum_weights=cumulative)[0]](i)
+
+
+async def _send(client: httpx.AsyncClient, request: dict[str, Any], scheduled: float, results: Results) -> None:
+    ok = False
+    try:
+        response = await client.request(
+            request.get("method", "GET"),
+            request["path"],
+            json=request.get("json"),
+            content=request.get("body"),
+            headers=request.get("headers"),
+        )
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        pass
+    # Measured from the scheduled start so queueing delay is not hidden.
+    results.record(request["path"], time.perf_counter() - scheduled, ok)
+
+
+async def open_loop(client, source, rate: float, duration: float, results: Results) -> None:
+    """Issue requests at a fixed arrival rate regardless of response times."""
+    tasks = set()
+    results.started = time.perf_counter()
+    for i in itertools.count():
+        scheduled = results.started + i / rate
+        if scheduled - results.started >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(_send(client, next(source), scheduled, results))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+    results.finished = time.perf_counter()
+
+
+async def closed_loop(client, source, concurrency: int, ramp_up: float, duration: float, results: Results) -> None:
+    """Run ``concurrency`` users back to back, started evenly over ``ramp_up`` seconds."""
+    results.started = time.perf_counter()
+    deadline = results.started + duration
+
+    async def _user(index: int) -> None:
+        await asyncio.sleep(ramp_up * index / concurrency)
+        while time.perf_counter() < deadline:
+            await _send(client, next(source), time.perf_counter(), results)
+
+    await asyncio.gather(*(_user(i) for i in range(concurrency)))
+    results.finished = time.perf_counter()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(workers: int) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            if httpx.get(f"{base_url}/healthcheck").status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit("uvicorn did not become healthy")
+
+
+def _client(url: Optional[str], concurrency: int) -> httpx.AsyncClient:
+    if url is None:
+        from src.main import app
+
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest")
+    limits = httpx.Limits(max_connections=max(concurrency, 100), max_keepalive_connections=max(concurrency, 100))
+    return httpx.AsyncClient(base_url=url, limits=limits, timeout=30)
+
+
+async def run(args: argparse.Namespace, url: Optional[str]) -> dict[str, Any]:
+    source = replay_source(args.replay) if args.replay else synthetic_source(args.mix, args.seed)
+    results = Results()
+    async with _client(url, args.concurrency) as client:
+        if args.rate:
+            await open_loop(client, source, args.rate, args.duration, results)
+        else:
+            await closed_loop(client, source, args.concurrency, args.ramp_up, args.duration, results)
+    return results.report()
+
+
+def _print(report: dict[str, Any]) -> None:
+    header = f"{'endpoint':<20} {'requests':>9} {'req/s':>9} {'errors':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'p999':>8}"
+    print(header)
+    rows = [*report["endpoints"].items(), ("total", report["total"])]
+    for name, s in rows:
+        print(
+            f"{name:<20} {s['requests']:>9} {s['throughput']:>9.1f} {s['error_rate']:>7.2%} "
+            f"{s['p50']:>8.2f} {s['p95']:>8.2f} {s['p99']:>8.2f} {s['p999']:>8.2f}"
+        )
+    print("latencies in ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", help="JSONL file of recorded requests")
+    source.add_argument("--mix", default="product=5,payment=3,healthcheck=2", help="synthetic endpoint weights")
+    parser.add_argument("--seed", type=int, default=fixtures.SEED)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--rate", type=float, help="open-loop arrival rate in requests/s")
+    parser.add_argument("--concurrency", type=int, default=10, help="closed-loop users")
+    parser.add_argument("--ramp-up", type=float, default=0, help="seconds to start all closed-loop users")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="base URL of a running server")
+    target.add_argument("--workers", type=int, help="spawn uvicorn with this many workers")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--max-error-rate", type=float, default=None, help="exit non-zero above this error rate")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    process, url = (spawn_server(args.workers) if args.workers else (None, args.url))
+    try:
+        report = asyncio.run(run(args, url))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    _print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.max_error_rate is not None and report["total"]["error_rate"] > args.max_error_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
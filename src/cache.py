@@ -0,0 +1,296 @@
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import Executable
+
+from src import redis as redis_store
+from src.config import settings
+from src.local_cache import LRUCache
+from src.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "cache:query:"
+TAG_PREFIX = "cache:tag:"
+LOCK_PREFIX = "cache:lock:"
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+@dataclass
+class CacheStats:
+    l1_hits: int = 0
+    l1_misses: int = 0
+    hits: int = 0
+    misses: int = 0
+    refills: int = 0
+    invalidations: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+    @staticmethod
+    def ratio(hits: int, misses: int) -> float:
+        return hits / (hits + misses) if hits + misses else 0.0
+
+
+stats = CacheStats()
+# Encoded values by key, in front of Redis; kept coherent across workers by
+# INVALIDATION_CHANNEL and bounded in age by CACHE_L1_TTL.
+l1 = LRUCache(settings.CACHE_L1_SIZE, max_bytes=settings.CACHE_L1_MAX_BYTES)
+
+# Digest of the compiled SQL by SQLAlchemy statement cache key; the digest,
+# not the cache key, goes into Redis keys so they match across workers.
+_sql_digests = LRUCache(settings.DATABASE_QUERY_CACHE_SIZE)
+
+# Set when an invalidation could not reach Redis; the namespace is flushed
+# before Redis is used again, since its entries may predate those writes.
+_stale = False
+
+registry.gauge("cache_l1_hit_ratio", "Hit ratio of the in-process cache tier", lambda: stats.ratio(stats.l1_hits, stats.l1_misses))
+registry.gauge("cache_redis_hit_ratio", "Hit ratio of the Redis cache tier", lambda: stats.ratio(stats.hits, stats.misses))
+registry.gauge("cache_l1_bytes", "Bytes held by the in-process cache tier", lambda: l1.bytes)
+
+
+@dataclass(frozen=True, slots=True)
+class Codec:
+    """
+    Encodes cached values to bytes and back. Values are never pickled, so
+    whoever can write to the shared Redis cannot run code in the workers.
+    """
+
+    dump: Callable[[Any], bytes]
+    load: Callable[[bytes], Any]
+
+
+def statement_key(namespace: str, stmt: Executable) -> str:
+    """
+    Build a cache key from the statement's SQL and its bound parameters.
+
+    The SQL is compiled once per statement shape, found by SQLAlchemy's own
+    cache key, so a lookup only walks the statement to extract its values.
+    """
+    cache_key = stmt._generate_cache_key()
+    if cache_key is None:
+        compiled = stmt.compile()
+        params = sorted((k, repr(v)) for k, v in compiled.params.items())
+        digest = hashlib.sha1(f"{compiled}|{params}".encode()).hexdigest()
+        return f"{CACHE_PREFIX}{namespace}:{digest}"
+
+    sql_digest = _sql_digests.get(cache_key.key)
+    if sql_digest is None:
+        sql_digest = hashlib.sha1(str(stmt.compile()).encode()).hexdigest()
+        _sql_digests.set(cache_key.key, sql_digest)
+    params = [repr(bind.effective_value) for bind in cache_key.bindparams]
+    digest = hashlib.sha1(f"{sql_digest}|{params}".encode()).hexdigest()
+    return f"{CACHE_PREFIX}{namespace}:{digest}"
+
+
+def query_key(name: str, **params: Any) -> str:
+    """Cache key of a named query; unlike ``statement_key`` it needs no statement traversal."""
+    args = ",".join(f"{k}={params[k]!r}" for k in sorted(params))
+    return f"{CACHE_PREFIX}{name}:{args}"
+
+
+def tag_key(tag: str) -> str:
+    return f"{TAG_PREFIX}{tag}"
+
+
+def _l1_set(key: str, data: bytes) -> None:
+    if settings.CACHE_L1_TTL:
+        l1.set(key, data, settings.CACHE_L1_TTL)
+
+
+async def _store(client: Redis, key: str, data: bytes, tags: Iterable[str], ttl: int) -> None:
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.set(key, data, ex=ttl)
+        for tag in tags:
+            pipe.sadd(tag_key(tag), key)
+            pipe.expire(tag_key(tag), ttl * 2)
+        await pipe.execute()
+
+
+# Stands for an absent or undecodable entry; ``None`` is a cacheable value.
+_MISSING = object()
+
+
+def _decode(codec: Codec, key: str, data: Optional[bytes]) -> Any:
+    if data is None:
+        return _MISSING
+    try:
+        return codec.load(data)
+    except ValueError as ex:
+        # E.g. an entry in an older format; it is refilled like a miss.
+        logger.warning(f"Ignoring undecodable cache entry {key}: {ex!r}")
+        return _MISSING
+
+
+async def _flush(client: Redis) -> None:
+    """Drop every cached query and tag set from Redis and from the in-process tier of every worker."""
+    global _stale
+    for pattern in (f"{CACHE_PREFIX}*", f"{TAG_PREFIX}*"):
+        keys = [key async for key in client.scan_iter(match=pattern, count=redis_store.BATCH_SIZE)]
+        await redis_store.unlink(client, keys)
+    l1.clear()
+    await client.publish(INVALIDATION_CHANNEL, json.dumps("*"))
+    _stale = False
+    logger.info("Flushed the query cache after missed invalidations")
+
+
+async def read_through(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    tags: Callable[[Any], Iterable[str]],
+    codec: Codec,
+    *,
+    ttl: Optional[int] = None,
+) -> Any:
+    """
+    Return the cached value for ``key`` from the in-process tier, then
+    Redis, or load, store and tag it. Values are stored as ``codec`` encodes them.
+
+    Only one caller refills an expired key; concurrent callers wait for the
+    refill up to ``CACHE_LOCK_TIMEOUT`` and then fall back to the loader.
+    While Redis is unconfigured or unreachable the loader is called directly.
+    """
+    client = redis_store.get_client()
+    if client is None:
+        return await loader()
+
+    if settings.CACHE_L1_TTL and not _stale:
+        value = _decode(codec, key, l1.get(key))
+        if value is not _MISSING:
+            stats.l1_hits += 1
+            return value
+        stats.l1_misses += 1
+
+    ttl = ttl or settings.CACHE_TTL
+    try:
+        if _stale:
+            await _flush(client)
+        cached = await client.get(key)
+        value = _decode(codec, key, cached)
+        if value is not _MISSING:
+            stats.hits += 1
+            _l1_set(key, cached)
+            return value
+
+        stats.misses += 1
+        lock, token = f"{LOCK_PREFIX}{key}", uuid.uuid4().hex
+        acquired = await client.set(lock, token, nx=True, ex=settings.CACHE_LOCK_TIMEOUT)
+        if not acquired:
+            waited = 0.0
+            while waited < settings.CACHE_LOCK_TIMEOUT:
+                await asyncio.sleep(0.05)
+                waited += 0.05
+                cached = await client.get(key)
+                value = _decode(codec, key, cached)
+                if value is not _MISSING:
+                    stats.hits += 1
+                    _l1_set(key, cached)
+                    return value
+    except RedisError as ex:
+        stats.errors += 1
+        redis_store.breaker.record_failure()
+        logger.warning(f"Cache read failed for {key}: {ex!r}")
+        return await loader()
+
+    value = await loader()
+    if not acquired:
+        return value
+
+    data = codec.dump(value)
+    _l1_set(key, data)
+    try:
+        await _store(client, key, data, tags(value), ttl)
+        stats.refills += 1
+    except RedisError as ex:
+        stats.errors += 1
+        redis_store.breaker.record_failure()
+        logger.warning(f"Cache write failed for {key}: {ex!r}")
+    finally:
+        # Only release our own lock, it may have expired and been re-taken.
+        await redis_store.compare_and_delete(lock, token)
+    return value
+
+
+async def invalidate_tags(tags: Iterable[str]) -> None:
+    """
+    Drop every cache entry registered under any of ``tags`` from Redis and
+    from the in-process tier of every worker.
+
+    If Redis cannot be reached, the whole namespace is flushed once it can.
+    """
+    global _stale
+    tag_keys = [tag_key(tag) for tag in tags]
+    if not tag_keys:
+        return
+
+    client = redis_store.get_client()
+    if client is None:
+        # Without the tag sets we cannot tell which local entries are affected.
+        l1.clear()
+        if redis_store.redis_client is not None:
+            _stale = True
+        return
+
+    try:
+        if _stale:
+            await _flush(client)
+            return
+        async with client.pipeline(transaction=False) as pipe:
+            for key in tag_keys:
+                pipe.smembers(key)
+            members = await pipe.execute()
+
+        keys = sorted({key.decode() for group in members for key in group})
+        for key in keys:
+            l1.delete(key)
+        await redis_store.unlink(client, [*keys, *tag_keys])
+        if keys:
+            await client.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+        stats.invalidations += len(keys)
+    except RedisError as ex:
+        stats.errors += 1
+        l1.clear()
+        _stale = True
+        redis_store.breaker.record_failure()
+        logger.warning(f"Cache invalidation failed for {tag_keys}, flushing once Redis recovers: {ex!r}")
+
+
+async def listen_for_invalidations() -> None:
+    """
+    Evict keys invalidated by other workers from the in-process tier, or
+    the whole tier on a flush (``"*"``). The tier is cleared on every
+    (re)subscribe, since messages published while disconnected are lost.
+    """
+    backoff = 1
+    while True:
+        client = redis_store.get_client()
+        if client is None:
+            await asyncio.sleep(backoff)
+            continue
+        try:
+            async with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                l1.clear()
+                backoff = 1
+                async for message in pubsub.listen():
+                    keys = json.loads(message["data"])
+                    if keys == "*":
+                        l1.clear()
+                        continue
+                    for key in keys:
+                        l1.delete(key)
+        except RedisError as ex:
+            l1.clear()
+            logger.warning(f"Cache invalidation listener disconnected, retrying in {backoff}s: {ex!r}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, settings.REDIS_MAX_RECONNECT_BACKOFF)
@@ -0,0 +1,123 @@
+import argparse
+import importlib.util
+import logging
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclass(slots=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure_imports(module: str) -> list[ImportTiming]:
+    """Import ``module`` in a fresh interpreter with ``-X importtime`` and parse the report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    timings, errors = [], []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(ImportTiming(name, int(self_us), int(cumulative_us), len(indent) // 2))
+        elif not line.startswith("import time:"):
+            errors.append(line)
+    if result.returncode:
+        raise RuntimeError(f"import {module} failed:\n" + "\n".join(errors))
+    return timings
+
+
+def importtime(args: argparse.Namespace) -> int:
+    timings = measure_imports(args.module)
+    total = next(t for t in reversed(timings) if t.module == args.module)
+    key = (lambda t: t.self_us) if args.sort == "self" else (lambda t: t.cumulative_us)
+    rows = [t for t in timings if args.all or t.depth <= args.depth]
+
+    print(f"{'self ms':>9} {'cumul. ms':>10}  module")
+    for timing in sorted(rows, key=key, reverse=True)[: args.top]:
+        print(f"{timing.self_us / 1000:9.1f} {timing.cumulative_us / 1000:10.1f}  {timing.module}")
+    print(f"\n{len(timings)} modules, import {args.module} took {total.cumulative_us / 1000:.1f} ms")
+    return 0
+
+
+def default_workers() -> int:
+    """CPUs this process may run on, which respects container CPU sets."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Run the app under uvicorn's process supervisor, even with one worker, so
+    SIGHUP replaces workers one at a time: each replacement must finish its
+    lifespan startup (including the warm-up) before the old worker is
+    stopped. SIGTTIN/SIGTTOU add or remove a worker.
+    """
+    import uvicorn
+    from uvicorn.supervisors import Multiprocess
+
+    from src.config import settings
+
+    config = uvicorn.Config(
+        "src.main:app",
+        host=args.host or settings.SERVER_HOST,
+        port=args.port or settings.SERVER_PORT,
+        workers=args.workers or settings.SERVER_WORKERS or default_workers(),
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=settings.SERVER_MAX_REQUESTS,
+        limit_max_requests_jitter=settings.SERVER_MAX_REQUESTS_JITTER,
+        proxy_headers=True,
+    )
+    logger = logging.getLogger("uvicorn.error")
+    logger.info(f"Serving with {config.workers} workers, loop={config.loop}, http={config.http}")
+    if config.workers > 1 and settings.IDEMPOTENCY_BACKEND == "memory":
+        logger.warning(
+            "IDEMPOTENCY_BACKEND=memory keeps keys per worker, so a retry reaching "
+            "another worker is processed again; use IDEMPOTENCY_BACKEND=redis"
+        )
+    if config.workers > 1 and settings.SESSION_BACKEND == "memory":
+        logger.warning(
+            "SESSION_BACKEND=memory keeps sessions per worker, so they are lost when "
+            "a request reaches another worker; use SESSION_BACKEND=redis"
+        )
+    sock = config.bind_socket()
+    Multiprocess(config, sockets=[sock]).run()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importtime_parser = commands.add_parser("importtime", help="report where startup import time goes")
+    importtime_parser.add_argument("module", nargs="?", default="src.main")
+    importtime_parser.add_argument("--top", type=int, default=25)
+    importtime_parser.add_argument("--sort", choices=("cumulative", "self"), default="cumulative")
+    importtime_parser.add_argument("--depth", type=int, default=2, help="only show imports nested this deep")
+    importtime_parser.add_argument("--all", action="store_true", help="show imports at any depth")
+    importtime_parser.set_defaults(handler=importtime)
+
+    serve_parser = commands.add_parser("serve", help="run the app with multiple worker processes")
+    serve_parser.add_argument("--host", help="defaults to SERVER_HOST")
+    serve_parser.add_argument("--port", type=int, help="defaults to SERVER_PORT")
+    serve_parser.add_argument("--workers", type=int, help="defaults to SERVER_WORKERS or the CPU count")
+    serve_parser.set_defaults(handler=serve)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
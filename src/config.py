@@ -1,14 +1,112 @@
 from pydantic import PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
+
+from src.constants import Environment
 
 
 class Settings(BaseSettings):
+    # Comma-separated Fernet keys, newest first; older keys only decrypt
     ENCRYPTION_KEY: str
+    # "thread" or "process" pool for batch encryption
+    ENCRYPTION_EXECUTOR: str = "thread"
+    ENCRYPTION_WORKERS: int = 4
     SECRET_KEY: str
-    # DATABASE_URL: PostgresDsn
+    DATABASE_URL: PostgresDsn
     CORS_ORIGINS: str
     CORS_HEADERS: str
+    ENVIRONMENT: Environment = Environment.PRODUCTION
+
+    DATABASE_POOL_SIZE: int = 30
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 300
+    DATABASE_POOL_PRE_PING: bool = True
+    # Adaptive overflow: grow max_overflow up to the limit while p95 checkout
+    # wait exceeds DATABASE_POOL_TARGET_WAIT seconds
+    DATABASE_POOL_ADAPTIVE: bool = False
+    DATABASE_POOL_MAX_OVERFLOW_LIMIT: int = 40
+    DATABASE_POOL_TARGET_WAIT: float = 0.05
+    DATABASE_POOL_ADAPT_INTERVAL: int = 15
+    # SQLAlchemy compiled statements kept per engine, and asyncpg prepared
+    # statements kept per connection
+    DATABASE_QUERY_CACHE_SIZE: int = 1200
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # Set when connecting through PgBouncer in transaction pooling mode
+    DATABASE_PGBOUNCER: bool = False
+    # Comma-separated read replica URLs; SELECTs are routed to them
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_POOL_SIZE: int = 20
+    # Replicas lagging further behind are skipped until they catch up
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 2.0
+
+    # Opt-in SQL profiling, see src/query_profiler.py
+    QUERY_PROFILING: bool = False
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    # "resend", "smtp" or "file" (writes messages to EMAIL_OUTBOX_DIR)
+    EMAIL_TRANSPORT: str = "file"
+    EMAIL_FROM: str = "Info <info@ibupedia.com>"
+    EMAIL_OUTBOX_DIR: str = "outbox"
+    RESEND_API_KEY: Optional[str] = None
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 25
+    NOTIFICATION_WORKERS: int = 4
+    NOTIFICATION_QUEUE_SIZE: int = 10_000
+    NOTIFICATION_BATCH_SIZE: int = 50
+    NOTIFICATION_MAX_RETRIES: int = 5
+
+    # JSON list of IIN ranges, defaults to src/payment/bin_ranges.json
+    CARD_BIN_TABLE: Optional[str] = None
+
+    # "memory" or "redis"; redis shares idempotency keys across workers, the
+    # memory backend only deduplicates retries that reach the same worker
+    IDEMPOTENCY_BACKEND: str = "memory"
+    IDEMPOTENCY_TTL: int = 24 * 60 * 60
+
+    # Server-side sessions: "memory" or "redis"
+    SESSION_BACKEND: str = "memory"
+    SESSION_COOKIE: str = "session_id"
+    SESSION_TTL: int = 14 * 24 * 60 * 60
+    SESSION_HTTPS_ONLY: bool = False
+    # Comma-separated path prefixes served without a session
+    SESSION_EXCLUDED_PATHS: str = "/healthcheck,/metrics,/static,/product,/payment"
+
+    REDIS_URL: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 1.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 5
+    REDIS_MAX_RECONNECT_BACKOFF: int = 60
+    # Consecutive failures before Redis calls are short-circuited, and
+    # seconds before they are tried again
+    REDIS_BREAKER_FAILURES: int = 5
+    REDIS_BREAKER_RESET: int = 10
+    REDIS_LOCAL_CACHE_SIZE: int = 10_000
+
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # Defaults to the number of CPUs available to the process
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE: int = 5
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    # Workers are recycled after this many requests plus up to
+    # SERVER_MAX_REQUESTS_JITTER more, so they do not all restart together
+    SERVER_MAX_REQUESTS: Optional[int] = 10_000
+    SERVER_MAX_REQUESTS_JITTER: int = 1_000
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5
+    WARMUP_REDIS_CONNECTIONS: int = 5
+    WARMUP_TIMEOUT: float = 10.0
+
+    CACHE_TTL: int = 300
+    CACHE_LOCK_TIMEOUT: int = 5
+    # Per-worker tier in front of Redis; CACHE_L1_TTL = 0 disables it
+    CACHE_L1_SIZE: int = 10_000
+    CACHE_L1_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_L1_TTL: int = 30
 
     def _comma_separated_values(self, value: str) -> List[str]:
         return [v.strip() for v in value.split(",")]
@@ -21,6 +119,14 @@ class Settings(BaseSettings):
     def parse_cors_headers(cls, value: str) -> List[str]:
         return cls._comma_separated_values(cls, value)
 
+    @field_validator("SESSION_EXCLUDED_PATHS")
+    def parse_session_excluded_paths(cls, value: str) -> List[str]:
+        return [v for v in cls._comma_separated_values(cls, value) if v]
+
+    @field_validator("DATABASE_REPLICA_URLS")
+    def parse_replica_urls(cls, value: str) -> List[str]:
+        return [v for v in cls._comma_separated_values(cls, value) if v]
+
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8')
 
 settings = Settings()
\ No newline at end of file
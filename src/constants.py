@@ -8,6 +8,14 @@ DB_NAMING_CONVENTION = {
     "pk": "%(table_name)s_pkey",
 }
 
+# Session.info keys used by src.database.unit_of_work
+UOW_DEPTH_KEY = "unit_of_work_depth"
+UOW_PENDING_KEY = "unit_of_work_pending"
+# Set by src.database_replicas.RoutingSession once the session has written
+READ_PRIMARY_KEY = "read_primary"
+# Depth of src.database_replicas.read_primary blocks open on the session
+READ_PRIMARY_DEPTH_KEY = "read_primary_depth"
+
 
 class Environment(str, Enum):
     LOCAL = "LOCAL"
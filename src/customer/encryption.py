@@ -0,0 +1,256 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from sqlalchemy import String, column as sql_column, select, update, values
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.types import TypeDecorator
+
+from src.config import settings
+from src.database_replicas import read_primary
+
+logger = logging.getLogger(__name__)
+
+# Values per executor task; large enough to amortize the hand-off.
+CHUNK_SIZE = 500
+
+
+@lru_cache
+def _multi_fernet(keys: tuple[str, ...]) -> MultiFernet:
+    """Build the key ring once per process; the first key encrypts."""
+    return MultiFernet([Fernet(key) for key in keys])
+
+
+def _encrypt_chunk(keys: tuple[str, ...], values: list[str]) -> list[str]:
+    fernet = _multi_fernet(keys)
+    return [fernet.encrypt(v.encode()).decode() for v in values]
+
+
+def _decrypt_chunk(keys: tuple[str, ...], tokens: list[str]) -> list[str]:
+    fernet = _multi_fernet(keys)
+    return [fernet.decrypt(t.encode()).decode() for t in tokens]
+
+
+def _rotate_chunk(keys: tuple[str, ...], tokens: list[str]) -> list[str]:
+    fernet = _multi_fernet(keys)
+    return [fernet.rotate(t.encode()).decode() for t in tokens]
+
+
+def _outdated_chunk(keys: tuple[str, ...], tokens: list[str]) -> list[bool]:
+    # extract_timestamp only checks the signature, it does not decrypt.
+    primary = _multi_fernet(keys[:1])
+    outdated = []
+    for token in tokens:
+        try:
+            primary.extract_timestamp(token.encode())
+            outdated.append(False)
+        except InvalidToken:
+            outdated.append(True)
+    return outdated
+
+
+class EncryptionService:
+    """
+    Fernet encryption with key rotation. Single values are handled inline;
+    the ``*_many`` coroutines split their input into chunks and run them on
+    a thread or process pool so bulk work never blocks the event loop.
+    """
+
+    def __init__(self, keys: Iterable[str], executor: Executor) -> None:
+        self.keys = tuple(keys)
+        self.executor = executor
+
+    def encrypt(self, value: str) -> str:
+        return _encrypt_chunk(self.keys, [value])[0]
+
+    def decrypt(self, token: str) -> str:
+        return _decrypt_chunk(self.keys, [token])[0]
+
+    async def _map(self, func, values: list[str]) -> list[str]:
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, func, self.keys, values[i:i + CHUNK_SIZE])
+                for i in range(0, len(values), CHUNK_SIZE)
+            )
+        )
+        return [value for chunk in chunks for value in chunk]
+
+    async def encrypt_many(self, values: list[str]) -> list[str]:
+        return await self._map(_encrypt_chunk, values)
+
+    async def decrypt_many(self, tokens: list[str]) -> list[str]:
+        return await self._map(_decrypt_chunk, tokens)
+
+    async def rotate_many(self, tokens: list[str]) -> list[str]:
+        """Re-encrypt ``tokens`` with the primary key."""
+        return await self._map(_rotate_chunk, tokens)
+
+    async def outdated_many(self, tokens: list[str]) -> list[bool]:
+        """Whether each of ``tokens`` was encrypted with a key other than the primary one."""
+        return await self._map(_outdated_chunk, tokens)
+
+
+@lru_cache
+def get_encryption_service() -> EncryptionService:
+    keys = [key.strip() for key in settings.ENCRYPTION_KEY.split(",") if key.strip()]
+    if settings.ENCRYPTION_EXECUTOR == "process":
+        executor = ProcessPoolExecutor(max_workers=settings.ENCRYPTION_WORKERS)
+    else:
+        executor = ThreadPoolExecutor(max_workers=settings.ENCRYPTION_WORKERS, thread_name_prefix="encryption")
+    return EncryptionService(keys, executor)
+
+
+class EncryptedValue:
+    """A Fernet token loaded from the database, decrypted on first access."""
+
+    __slots__ = ("token", "_plaintext")
+
+    def __init__(self, token: str, plaintext: Optional[str] = None) -> None:
+        self.token = token
+        self._plaintext = plaintext
+
+    @property
+    def value(self) -> str:
+        if self._plaintext is None:
+            self._plaintext = get_encryption_service().decrypt(self.token)
+        return self._plaintext
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, EncryptedValue):
+            return self.token == other.token or self.value == other.value
+        return self.value == other
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __repr__(self) -> str:
+        return "EncryptedValue(...)"
+
+
+class EncryptedString(TypeDecorator):
+    """
+    Column type that stores Fernet tokens. Plain strings are encrypted on
+    write; loaded values are ``EncryptedValue`` objects that only decrypt
+    when read, and are written back unchanged without re-encryption.
+
+    Both happen inline on the event loop, one value at a time. Code that
+    reads or writes many rows should call ``decrypt_attributes`` or
+    ``encrypt_attributes`` first, so the work runs in bulk on the executor.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, EncryptedValue):
+            return value.token
+        return get_encryption_service().encrypt(value)
+
+    def process_result_value(self, value: Optional[str], dialect) -> Optional[EncryptedValue]:
+        if value is None:
+            return None
+        return EncryptedValue(value)
+
+
+async def decrypt_attributes(instances: Iterable[Any], attributes: Iterable[str]) -> None:
+    """Decrypt the ``EncryptedValue`` attributes of ``instances`` in one ``decrypt_many`` call."""
+    pending = [
+        value
+        for instance in instances
+        for value in (getattr(instance, attribute) for attribute in attributes)
+        if isinstance(value, EncryptedValue) and value._plaintext is None
+    ]
+    if not pending:
+        return
+    plaintexts = await get_encryption_service().decrypt_many([value.token for value in pending])
+    for value, plaintext in zip(pending, plaintexts):
+        value._plaintext = plaintext
+
+
+async def encrypt_attributes(instances: Iterable[Any], attributes: Iterable[str]) -> None:
+    """
+    Replace the plain string attributes of ``instances`` with
+    ``EncryptedValue`` objects from one ``encrypt_many`` call, so the flush
+    writes their tokens without encrypting inline.
+    """
+    pending = [
+        (instance, attribute, value)
+        for instance in instances
+        for attribute in attributes
+        if isinstance(value := getattr(instance, attribute), str)
+    ]
+    if not pending:
+        return
+    tokens = await get_encryption_service().encrypt_many([value for _, _, value in pending])
+    for (instance, attribute, value), token in zip(pending, tokens):
+        setattr(instance, attribute, EncryptedValue(token, value))
+
+
+async def reencrypt_column(
+    session_factory: async_sessionmaker, column, batch_size: int = 1000
+) -> int:
+    """
+    Rotate every token in ``column`` (e.g. ``Customer.address``) that is not
+    under the primary key, one keyset-paginated batch and commit at a time
+    so it can run in the background against live traffic.
+
+    Batches are read from the primary. A row is only updated if it still
+    holds the token that was rotated, so a concurrent write wins; passes
+    repeat until one leaves no outdated token behind.
+    """
+    model = column.class_
+    primary_key = model.__mapper__.primary_key[0]
+    table_column = model.__table__.c[column.key]
+    service = get_encryption_service()
+    rotated = 0
+
+    while True:
+        last_id = None
+        skipped = 0
+        while True:
+            stmt = select(primary_key, column).where(column.is_not(None)).order_by(primary_key).limit(batch_size)
+            if last_id is not None:
+                stmt = stmt.where(primary_key > last_id)
+
+            async with session_factory() as session:
+                with read_primary(session):
+                    rows = (await session.execute(stmt)).all()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+                    outdated = await service.outdated_many([value.token for _, value in rows])
+                    rows = [row for row, is_outdated in zip(rows, outdated) if is_outdated]
+                    if not rows:
+                        continue
+                    tokens = await service.rotate_many([value.token for _, value in rows])
+                    rotation = values(
+                        sql_column("id", primary_key.type),
+                        sql_column("old_token", String()),
+                        sql_column("token", String()),
+                        name="rotation",
+                    ).data([(row_id, value.token, token) for (row_id, value), token in zip(rows, tokens)])
+                    result = await session.execute(
+                        update(model.__table__)
+                        .where(primary_key == rotation.c.id, table_column == rotation.c.old_token)
+                        .values({column.key: rotation.c.token})
+                        .returning(primary_key)
+                    )
+                    updated = len(result.all())
+                    await session.commit()
+
+            rotated += updated
+            skipped += len(rows) - updated
+            logger.info(f"Re-encrypted {rotated} values of {model.__tablename__}.{column.key}")
+
+        if not skipped:
+            return rotated
+        logger.info(f"{skipped} values of {model.__tablename__}.{column.key} changed while rotating, rescanning")
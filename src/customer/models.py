@@ -0,0 +1,39 @@
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, String
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import mapped_column
+
+from src.customer.encryption import EncryptedString, decrypt_attributes, encrypt_attributes
+from src.models import Base
+
+
+class Customer(Base):
+    __tablename__ = 'customers'
+
+    id = mapped_column(Integer, primary_key=True, autoincrement=True)
+    first_name = mapped_column(String(100), nullable=False)
+    last_name = mapped_column(String(100), nullable=False)
+    # PII is stored as Fernet tokens and decrypted lazily on access
+    email = mapped_column(EncryptedString, nullable=False)
+    address = mapped_column(EncryptedString)
+
+    ENCRYPTED_ATTRIBUTES = ("email", "address")
+
+    @classmethod
+    async def decrypt_all(cls, customers: list["Customer"]) -> list["Customer"]:
+        """Decrypt the PII of loaded ``customers`` in bulk, off the event loop."""
+        await decrypt_attributes(customers, cls.ENCRYPTED_ATTRIBUTES)
+        return customers
+
+    @classmethod
+    async def save_all(cls, db: AsyncSession, customers: list["Customer"]) -> None:
+        """Encrypt the PII of ``customers`` in bulk, off the event loop, then save them."""
+        await encrypt_attributes(customers, cls.ENCRYPTED_ATTRIBUTES)
+        try:
+            db.add_all(customers)
+            await cls._commit(db, customers)
+        except SQLAlchemyError as ex:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
+            ) from ex
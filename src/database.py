@@ -1,5 +1,6 @@
 from typing import Any
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 from sqlalchemy import (
     Boolean,
     Column,
@@ -18,37 +19,89 @@ from sqlalchemy import (
     func,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
 
+from src.cache import invalidate_tags
 from src.config import settings
-from src.constants import DB_NAMING_CONVENTION
+from src.constants import DB_NAMING_CONVENTION, UOW_DEPTH_KEY, UOW_PENDING_KEY
+from src.database_pool import InstrumentedQueuePool, instrument_pool
+from src.database_replicas import RoutingSession, read_primary, replicas
+from src.queries import instrument_statement_caches, statement_cache_args
 
-DATABASE_URL = settings.DATABASE_URL
+DATABASE_URL = str(settings.DATABASE_URL)
 
 engine = create_async_engine(
     DATABASE_URL,
     future=True,
     echo=False,
-    pool_size=30,
-    max_overflow=10,
-    pool_pre_ping=True,
-    pool_recycle=300
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+    connect_args=statement_cache_args(DATABASE_URL),
 )
+instrument_pool(engine)
+instrument_statement_caches(engine)
 
 metadata = MetaData(naming_convention=DB_NAMING_CONVENTION)
 
 
 # expire_on_commit=False will prevent attributes from being expired
 # after commit.
+# With read replicas configured, sessions route SELECTs to them.
 AsyncSessionFactory = async_sessionmaker(
     engine,
     autoflush=False,
     expire_on_commit=False,
+    sync_session_class=RoutingSession if replicas else Session,
 )
 
 # Dependency
 async def get_db() -> AsyncGenerator:
     async with AsyncSessionFactory() as session:
-        # logger.debug(f"ASYNC Pool: {engine.pool.status()}")
         yield session
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession, *, savepoint: bool = False) -> AsyncIterator[AsyncSession]:
+    """
+    Defer the commits of the ``Base`` helpers to the end of the scope.
+
+    The outermost scope commits once on success and rolls back on error.
+    A nested scope with ``savepoint=True`` wraps its changes in a SAVEPOINT
+    so they can fail without aborting the enclosing unit of work. Reads in
+    the scope go to the primary, since writes are based on them.
+    """
+    depth = session.info.get(UOW_DEPTH_KEY, 0)
+    session.info[UOW_DEPTH_KEY] = depth + 1
+    try:
+        with read_primary(session):
+            if depth and savepoint:
+                async with session.begin_nested():
+                    yield session
+            else:
+                yield session
+        if not depth:
+            await session.commit()
+    except BaseException:
+        if not depth:
+            await session.rollback()
+            session.info.pop(UOW_PENDING_KEY, None)
+        raise
+    finally:
+        session.info[UOW_DEPTH_KEY] = depth
+
+    if not depth:
+        pending = session.info.pop(UOW_PENDING_KEY, [])
+        await invalidate_tags({tag for instance in pending for tag in instance.cache_tags()})
+
+
+async def get_uow() -> AsyncGenerator:
+    async with AsyncSessionFactory() as session:
+        async with unit_of_work(session):
+            yield session
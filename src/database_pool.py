@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.config import settings
+from src.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Metrics shared by every pool of one kind, named ``<prefix>_...``."""
+
+    def __init__(self, prefix: str, description: str) -> None:
+        self.prefix = prefix
+        self.description = description
+        self.engines: list[AsyncEngine] = []
+        self.checkout_wait = registry.histogram(
+            f"{prefix}_checkout_wait_seconds", f"Time spent waiting for a pooled connection to the {description}"
+        )
+        self.connection_age = registry.histogram(
+            f"{prefix}_connection_age_seconds",
+            f"Age of connections to the {description} at checkout",
+            buckets=(1, 10, 30, 60, 120, 300, 600, 1800, 3600),
+        )
+        self.checkout_timeouts = registry.counter(
+            f"{prefix}_checkout_timeouts_total", f"Checkouts from the {description} pool that hit pool_timeout"
+        )
+        self.checkout_errors = registry.counter(
+            f"{prefix}_checkout_errors_total",
+            f"Checkouts from the {description} pool that failed to connect, e.g. refused or rejected",
+        )
+        self.pre_ping_failures = registry.counter(
+            f"{prefix}_pre_ping_failures_total", f"Connections to the {description} found dead by pre-ping"
+        )
+        self.connections_opened = registry.counter(
+            f"{prefix}_connections_opened_total", f"New DBAPI connections to the {description}"
+        )
+
+    def _sum(self, read) -> float:
+        return sum(read(engine.sync_engine.pool) for engine in self.engines)
+
+    def register_gauges(self) -> None:
+        """Pool gauges summed over ``engines``; the pools are looked up at render time."""
+        registry.gauge(f"{self.prefix}_size", "Configured pool size", lambda: self._sum(lambda p: p.size()))
+        registry.gauge(f"{self.prefix}_checked_out", "Connections in use", lambda: self._sum(lambda p: p.checkedout()))
+        registry.gauge(f"{self.prefix}_idle", "Idle connections in the pool", lambda: self._sum(lambda p: p.checkedin()))
+        registry.gauge(
+            f"{self.prefix}_overflow",
+            "Connections opened beyond pool_size",
+            lambda: self._sum(lambda p: max(p.overflow(), 0)),
+        )
+        registry.gauge(f"{self.prefix}_max_overflow", "Current overflow limit", lambda: self._sum(lambda p: p._max_overflow))
+
+
+primary_metrics = PoolMetrics("db_pool", "primary")
+replica_metrics = PoolMetrics("db_replica_pool", "replicas")
+# The primary pool's histogram drives adapt_overflow.
+checkout_wait = primary_metrics.checkout_wait
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records how long each checkout waits."""
+
+    metrics = primary_metrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.checkout_timeouts.inc()
+            self.metrics.checkout_wait.observe(time.perf_counter() - started)
+            raise
+        except Exception:
+            # Not a wait for the pool, so kept out of checkout_wait, which
+            # drives adapt_overflow.
+            self.metrics.checkout_errors.inc()
+            raise
+        self.metrics.checkout_wait.observe(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedReplicaPool(InstrumentedQueuePool):
+    """Replica pools report as ``db_replica_pool_*``, so they do not skew the primary's metrics."""
+
+    metrics = replica_metrics
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Attach pool event listeners for ``engine`` and count it in its pool gauges."""
+    pool = engine.sync_engine.pool
+    metrics = pool.metrics
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        metrics.connections_opened.inc()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            metrics.connection_age.observe(time.monotonic() - connected_at)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _on_error(context):
+        if getattr(context, "is_pre_ping", False):
+            metrics.pre_ping_failures.inc()
+
+    if not metrics.engines:
+        metrics.register_gauges()
+    metrics.engines.append(engine)
+
+
+async def adapt_overflow(engine: AsyncEngine) -> None:
+    """
+    Periodically raise ``max_overflow`` while p95 checkout wait is above
+    ``DATABASE_POOL_TARGET_WAIT`` and lower it back towards the configured
+    value once waits are well under target.
+    """
+    pool = engine.sync_engine.pool
+    floor = settings.DATABASE_MAX_OVERFLOW
+    ceiling = settings.DATABASE_POOL_MAX_OVERFLOW_LIMIT
+    target = settings.DATABASE_POOL_TARGET_WAIT
+    step = max(1, settings.DATABASE_POOL_SIZE // 10)
+    baseline, _ = checkout_wait.snapshot()
+
+    while True:
+        await asyncio.sleep(settings.DATABASE_POOL_ADAPT_INTERVAL)
+        p95 = checkout_wait.quantile(0.95, since=baseline)
+        baseline, _ = checkout_wait.snapshot()
+
+        current = pool._max_overflow
+        if p95 > target and current < ceiling:
+            pool._max_overflow = min(current + step, ceiling)
+        elif p95 < target / 4 and current > floor:
+            pool._max_overflow = max(current - step, floor)
+        if pool._max_overflow != current:
+            logger.info(f"DB pool max_overflow {current} -> {pool._max_overflow} (p95 wait {p95}s)")
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import random
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import Select, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.constants import READ_PRIMARY_DEPTH_KEY, READ_PRIMARY_KEY
+from src.database_pool import InstrumentedReplicaPool, instrument_pool
+from src.metrics import registry
+from src.queries import instrument_statement_caches, statement_cache_args
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica's replayed WAL is behind the primary; 0 when it has
+# replayed everything it received, so an idle primary does not look like lag.
+LAG_QUERIES = {
+    "postgresql": """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END
+    """,
+}
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        self.engine: AsyncEngine = create_async_engine(
+            url,
+            poolclass=InstrumentedReplicaPool,
+            pool_size=settings.DATABASE_REPLICA_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+            query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+            connect_args=statement_cache_args(url),
+        )
+        instrument_pool(self.engine)
+        instrument_statement_caches(self.engine)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.lag = 0.0
+        self.healthy = True
+
+    async def check(self) -> None:
+        """Measure replication lag; a replica that fails or lags too far is skipped."""
+        query = LAG_QUERIES.get(self.engine.dialect.name)
+        try:
+            async with self.engine.connect() as conn:
+                self.lag = float(await conn.scalar(text(query))) if query else 0.0
+                healthy = self.lag <= settings.REPLICA_MAX_LAG_SECONDS
+        except Exception as ex:
+            logger.warning(f"Replica {self.name} check failed: {ex!r}")
+            healthy = False
+
+        if healthy != self.healthy:
+            state = "back in rotation" if healthy else f"out of rotation, lag {self.lag:.1f}s"
+            logger.warning(f"Replica {self.name} is {state}")
+        self.healthy = healthy
+
+
+replicas = [Replica(url) for url in settings.DATABASE_REPLICA_URLS]
+
+registry.gauge("db_replicas_healthy", "Read replicas in rotation", lambda: sum(r.healthy for r in replicas))
+registry.gauge("db_replica_max_lag_seconds", "Highest replication lag", lambda: max((r.lag for r in replicas), default=0))
+
+
+def choose_replica() -> Optional[Replica]:
+    healthy = [replica for replica in replicas if replica.healthy]
+    return random.choice(healthy) if healthy else None
+
+
+async def monitor_replicas() -> None:
+    while True:
+        await asyncio.gather(*(replica.check() for replica in replicas))
+        await asyncio.sleep(settings.REPLICA_LAG_CHECK_INTERVAL)
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to a healthy replica and everything else to the
+    primary. Once the session has written (a flush or a DML statement), it
+    reads from the primary too, so a request sees its own writes after
+    commit. ``SELECT ... FOR UPDATE`` and reads inside ``read_primary``
+    always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        primary = super().get_bind(mapper, clause=clause, **kw)
+        if clause is not None and not isinstance(clause, Select):
+            self.info[READ_PRIMARY_KEY] = True
+            return primary
+        if self.info.get(READ_PRIMARY_KEY) or self.info.get(READ_PRIMARY_DEPTH_KEY) or self._flushing:
+            return primary
+        if clause is None or clause._for_update_arg is not None:
+            return primary
+
+        replica = choose_replica()
+        return replica.engine.sync_engine if replica else primary
+
+
+@contextmanager
+def read_primary(session: Session | AsyncSession) -> Iterator[None]:
+    """
+    Route the reads of ``session`` inside the block to the primary, e.g.
+    the reads a write is based on. A write inside the block still makes the
+    session read from the primary afterwards.
+    """
+    session.info[READ_PRIMARY_DEPTH_KEY] = session.info.get(READ_PRIMARY_DEPTH_KEY, 0) + 1
+    try:
+        yield
+    finally:
+        session.info[READ_PRIMARY_DEPTH_KEY] -= 1
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _read_primary_after_flush(session: Session, flush_context) -> None:
+    session.info[READ_PRIMARY_KEY] = True
@@ -0,0 +1,68 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+def _sizeof(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Bounded in-process LRU with optional per-entry TTL in seconds. Evicts
+    least recently used entries past ``maxsize`` entries or, if set,
+    ``max_bytes`` of values as measured by ``sizeof``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = _sizeof,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._data: OrderedDict[Any, tuple[Optional[float], Any, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value, _ = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.delete(key)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        size = self.sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            self.delete(key)
+            return
+        self.delete(key)
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (expires_at, value, size)
+        self.bytes += size
+        while len(self._data) > self.maxsize or (self.max_bytes and self.bytes > self.max_bytes):
+            _, (_, _, evicted) = self._data.popitem(last=False)
+            self.bytes -= evicted
+
+    def delete(self, key: Any) -> bool:
+        item = self._data.pop(key, None)
+        if item is None:
+            return False
+        self.bytes -= item[2]
+        return True
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.bytes = 0
@@ -1,14 +1,51 @@
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from src.cache import listen_for_invalidations
 from src.config import settings
+from src.database import engine
+from src.database_pool import adapt_overflow
+from src.database_replicas import monitor_replicas, replicas
+from src.metrics import router as metrics_router
+from src.notification.dispatcher import start_dispatcher, stop_dispatcher
+from src.payment.idempotency import IdempotencyMiddleware, get_idempotency_store
+from src.redis import close_redis, init_redis
+from src.session import ServerSessionMiddleware, get_session_store
+from src.warmup import warm_up
+from src.responses import ModelJSONResponse
 from src.product.router import router as product_router
 from src.payment.router import router as payment_router
 
 from starlette.middleware.cors import CORSMiddleware
-from starlette.middleware.sessions import SessionMiddleware
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_redis()
+    tasks = [asyncio.create_task(listen_for_invalidations())]
+    if settings.DATABASE_POOL_ADAPTIVE:
+        tasks.append(asyncio.create_task(adapt_overflow(engine)))
+    if replicas:
+        tasks.append(asyncio.create_task(monitor_replicas()))
+    start_dispatcher()
+    if settings.WARMUP_ENABLED:
+        await warm_up()
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    await stop_dispatcher()
+    await close_redis()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ModelJSONResponse)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 app.add_middleware(
@@ -18,7 +55,30 @@ app.add_middleware(
     allow_methods=("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"),
     allow_headers=settings.CORS_HEADERS,
 )
-app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+app.add_middleware(
+    ServerSessionMiddleware,
+    store=get_session_store(),
+    cookie_name=settings.SESSION_COOKIE,
+    max_age=settings.SESSION_TTL,
+    excluded_paths=tuple(settings.SESSION_EXCLUDED_PATHS),
+    https_only=settings.SESSION_HTTPS_ONLY,
+)
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=get_idempotency_store(),
+    path_prefixes=("/payment",),
+    ttl=settings.IDEMPOTENCY_TTL,
+)
+
+if settings.QUERY_PROFILING:
+    from src import query_profiler
+
+    query_profiler.install(engine)
+    for replica in replicas:
+        query_profiler.install(replica.engine)
+    app.add_middleware(query_profiler.QueryProfilerMiddleware)
+    if settings.ENVIRONMENT.is_debug:
+        app.include_router(query_profiler.router)
 
 
 @app.get('/healthcheck', include_in_schema=False)
@@ -27,4 +87,5 @@ async def healthcheck() -> dict[str, str]:
 
 
 app.include_router(product_router)
-app.include_router(payment_router)
\ No newline at end of file
+app.include_router(payment_router)
+app.include_router(metrics_router)
\ No newline at end of file
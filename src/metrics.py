@@ -0,0 +1,116 @@
+import bisect
+import threading
+from typing import Callable, Iterable
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter(prefix="")
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} counter"
+        yield f"{self.name} {self.value}"
+
+
+class Gauge:
+    """A gauge whose value is read from ``getter`` at render time."""
+
+    def __init__(self, name: str, description: str, getter: Callable[[], float]) -> None:
+        self.name = name
+        self.description = description
+        self.getter = getter
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {self.getter()}"
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        # Pool events fire from whichever thread owns the connection.
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> tuple[list[int], int]:
+        with self._lock:
+            return list(self.counts), self.count
+
+    def quantile(self, q: float, since: list[int] | None = None) -> float:
+        """Estimate the ``q`` quantile as the upper bound of its bucket."""
+        counts, total = self.snapshot()
+        if since is not None:
+            counts = [c - s for c, s in zip(counts, since)]
+            total = sum(counts)
+        if not total:
+            return 0.0
+        running = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            running += count
+            if running >= q * total:
+                return bound
+        return float("inf")
+
+    def render(self) -> Iterable[str]:
+        counts, total = self.snapshot()
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        running = 0
+        for bound, count in zip((*self.buckets, "+Inf"), counts):
+            running += count
+            yield f'{self.name}_bucket{{le="{bound}"}} {running}'
+        yield f"{self.name}_sum {self.sum}"
+        yield f"{self.name}_count {total}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self.register(Counter(name, description))
+
+    def gauge(self, name: str, description: str, getter: Callable[[], float]) -> Gauge:
+        return self.register(Gauge(name, description, getter))
+
+    def histogram(self, name: str, description: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, buckets))
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics.values() for line in metric.render()) + "\n"
+
+
+registry = Registry()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
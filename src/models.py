@@ -1,14 +1,18 @@
 from datetime import datetime
-from typing import Any
+from types import UnionType
+from typing import Annotated, Any, ClassVar, Union, get_args, get_origin
 from zoneinfo import ZoneInfo
 from fastapi import HTTPException, status
-from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel, ConfigDict, model_validator
+from pydantic import AfterValidator, BaseModel, ConfigDict, TypeAdapter
 
-from asyncpg import UniqueViolationError
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import func, inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import declared_attr, DeclarativeBase
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.constants import UOW_DEPTH_KEY, UOW_PENDING_KEY
 
 
 def convert_datetime_to_gmt(dt: datetime) -> str:
@@ -18,28 +22,68 @@ def convert_datetime_to_gmt(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%dT%H:%M:%S%z")
 
 
+def set_null_microseconds(dt: datetime) -> datetime:
+    return dt.replace(microsecond=0) if dt.microsecond else dt
+
+
+def _null_microseconds(value: Any) -> Any:
+    return set_null_microseconds(value) if isinstance(value, datetime) else value
+
+
+DatetimeNoMicros = Annotated[datetime, AfterValidator(set_null_microseconds)]
+# Field-level, so it also sees None for Optional[datetime] fields.
+_NO_MICROSECONDS = AfterValidator(_null_microseconds)
+
+
+def _has_datetime(annotation: Any) -> bool:
+    """Whether ``annotation`` is ``datetime``, including inside Optional/Union."""
+    if annotation is datetime:
+        return True
+    return get_origin(annotation) in (Union, UnionType) and any(_has_datetime(a) for a in get_args(annotation))
+
+
 class CustomModel(BaseModel):
     model_config = ConfigDict(
         json_encoders={datetime: convert_datetime_to_gmt},
         populate_by_name=True,
     )
 
-    @model_validator(mode="before")
+    __list_adapter__: ClassVar[TypeAdapter | None] = None
+
     @classmethod
-    def set_null_microseconds(cls, data: dict[str, Any]) -> dict[str, Any]:
-        datetime_fields = {
-            k: v.replace(microsecond=0)
-            for k, v in data.items()
-            if isinstance(v, datetime)
-        }
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        # Runs once pydantic has resolved the annotations, so string and
+        # postponed (``from __future__ import annotations``) ones are seen
+        # too. Models without datetimes get no extra validation step.
+        super().__pydantic_init_subclass__(**kwargs)
+        fields = [
+            field for field in cls.model_fields.values()
+            if _has_datetime(field.annotation) and not any(m is _NO_MICROSECONDS for m in field.metadata)
+        ]
+        for field in fields:
+            field.metadata.append(_NO_MICROSECONDS)
+        if fields:
+            cls.model_rebuild(force=True)
 
-        return {**data, **datetime_fields}
+    @classmethod
+    def _list_adapter(cls) -> TypeAdapter:
+        if cls.__dict__.get("__list_adapter__") is None:
+            cls.__list_adapter__ = TypeAdapter(list[cls])
+        return cls.__list_adapter__
+
+    @classmethod
+    def validate_many(cls, items: list[Any]) -> list["CustomModel"]:
+        """Validate a list of payloads in a single pydantic-core call."""
+        return cls._list_adapter().validate_python(items)
+
+    @classmethod
+    def validate_many_json(cls, data: str | bytes) -> list["CustomModel"]:
+        """Validate a JSON array of payloads in a single pydantic-core call."""
+        return cls._list_adapter().validate_json(data)
 
     def serializable_dict(self, **kwargs):
         """Return a dict which contains only serializable fields."""
-        default_dict = self.model_dump()
-
-        return jsonable_encoder(default_dict)
+        return self.model_dump(mode="json", **kwargs)
 
 
 class Base(DeclarativeBase):
@@ -51,6 +95,28 @@ class Base(DeclarativeBase):
     def __tablename__(self) -> str:
         return self.__name__.lower()
 
+    def cache_tags(self) -> list[str]:
+        """Cache tags to invalidate when this row is written."""
+        return [self.__tablename__, f"{self.__tablename__}:{self.id}"]
+
+    @staticmethod
+    async def _commit(db: AsyncSession, instances: list["Base"]) -> None:
+        """
+        Commit and invalidate the cache entries of ``instances``.
+
+        Inside a ``unit_of_work`` scope the changes are only staged; the scope
+        commits once and invalidates every staged instance on exit.
+        """
+        if db.info.get(UOW_DEPTH_KEY):
+            db.info.setdefault(UOW_PENDING_KEY, []).extend(instances)
+            return
+
+        await db.commit()
+
+        from src.cache import invalidate_tags
+
+        await invalidate_tags({tag for instance in instances for tag in instance.cache_tags()})
+
     async def save(self, db_session: AsyncSession):
         """
 
@@ -59,7 +125,7 @@ class Base(DeclarativeBase):
         """
         try:
             db_session.add(self)
-            return await db_session.commit()
+            return await self._commit(db_session, [self])
         except SQLAlchemyError as ex:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
@@ -73,7 +139,7 @@ class Base(DeclarativeBase):
         """
         try:
             await db_session.delete(self)
-            await db_session.commit()
+            await self._commit(db_session, [self])
             return True
         except SQLAlchemyError as ex:
             raise HTTPException(
@@ -89,23 +155,88 @@ class Base(DeclarativeBase):
         try:
             for k, v in kwargs.items():
                 setattr(self, k, v)
-            return await db.commit()
+            return await self._commit(db, [self])
         except SQLAlchemyError as ex:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
             ) from ex
 
-    async def save_or_update(self, db: AsyncSession):
+    @classmethod
+    async def upsert(
+        cls,
+        db: AsyncSession,
+        rows: dict[str, Any] | list[dict[str, Any]],
+        conflict_cols: list[str],
+        update_cols: list[str] | None = None,
+    ):
+        """
+        Insert ``rows`` or update them on ``conflict_cols`` in one
+        ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` statement.
+
+        :param db:
+        :param rows: a single row or a list of rows as column dicts
+        :param conflict_cols: columns of the unique constraint to match on
+        :param update_cols: columns to overwrite on conflict, defaults to every
+            inserted column that is not a conflict column; ``updated_at`` is
+            refreshed too, since ``onupdate`` does not run on ON CONFLICT
+        :return: the upserted instance, or a list of them for a list of rows
+        """
+        many = isinstance(rows, list)
+        values = rows if many else [rows]
+        if not values:
+            return []
+        if update_cols is None:
+            update_cols = [c for c in values[0] if c not in conflict_cols]
+
+        stmt = insert(cls).values(values)
+        if update_cols:
+            set_ = {c: stmt.excluded[c] for c in update_cols}
+            if "updated_at" in cls.__table__.c and "updated_at" not in set_:
+                set_["updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=conflict_cols, set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_cols)
+        stmt = stmt.returning(cls).execution_options(populate_existing=True)
+
         try:
-            db.add(self)
-            return await db.commit()
-        except IntegrityError as exception:
-            if isinstance(exception.orig, UniqueViolationError):
-                return await db.merge(self)
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    detail=repr(exception),
-                ) from exception
-        finally:
-            await db.close()
\ No newline at end of file
+            result = await db.scalars(stmt)
+            instances = result.all()
+            await cls._commit(db, instances)
+        except SQLAlchemyError as ex:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
+            ) from ex
+
+        return instances if many else next(iter(instances), None)
+
+    async def save_or_update(self, db: AsyncSession):
+        """
+        Insert this row or update the existing row with the same primary key.
+
+        Every column attribute that was set is written, including explicit
+        ``None`` values; columns never set keep their defaults on insert and
+        their current values on update. A loaded ``updated_at`` that was not
+        changed is not written back, so ``upsert`` refreshes it. The stored
+        row, e.g. a generated ``id``, is copied back onto this instance.
+
+        :param db:
+        :return: the persisted instance
+        """
+        state = inspect(self)
+        mapper = state.mapper
+        primary_key = [c.key for c in mapper.primary_key]
+        row = {
+            attr.key: state.dict[attr.key]
+            for attr in mapper.column_attrs
+            if attr.key in state.dict and attr.columns[0].computed is None
+        }
+        update_cols = [
+            c for c in row
+            if c not in primary_key and (c != "updated_at" or state.attrs.updated_at.history.has_changes())
+        ]
+        instance = await self.upsert(db, row, conflict_cols=primary_key, update_cols=update_cols)
+        if instance is not None and instance is not self:
+            for attr in mapper.column_attrs:
+                if attr.key in inspect(instance).dict:
+                    set_committed_value(self, attr.key, getattr(instance, attr.key))
+        return instance
@@ -0,0 +1,128 @@
+import asyncio
+import contextlib
+import logging
+import random
+from typing import Any, Optional
+
+from src.config import settings
+from src.notification.schema import EmailMessage
+from src.notification.templates import render
+from src.notification.transport import BatchSendError, EmailTransport, get_transport
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Bounded queue drained by a fixed pool of workers. Each worker takes
+    whatever is queued up to ``batch_size`` and hands it to the transport in
+    one call, retrying failed batches with exponential backoff and jitter.
+    Messages the transport reports as sent before a failure are not retried.
+    """
+
+    def __init__(
+        self,
+        transport: EmailTransport,
+        *,
+        workers: int = 4,
+        queue_size: int = 10_000,
+        batch_size: int = 50,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+    ) -> None:
+        self.transport = transport
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.queue: asyncio.Queue[EmailMessage] = asyncio.Queue(maxsize=queue_size)
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Give queued messages ``timeout`` seconds to go out, then stop the workers."""
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.queue.join(), timeout)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, message: EmailMessage) -> bool:
+        """Queue ``message`` without waiting; returns False when the queue is full."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            logger.error(f"Notification queue full, dropping email to {message.to}")
+            return False
+
+    def send_email(
+        self, to_email: str, subject: str, template_file: str, context: Optional[dict[str, Any]] = None
+    ) -> bool:
+        return self.enqueue(
+            EmailMessage(
+                sender=settings.EMAIL_FROM,
+                to=[to_email],
+                subject=subject,
+                html=render(template_file, context or {}),
+            )
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await self._send(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _send(self, batch: list[EmailMessage]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.transport.send_batch(batch)
+                return
+            except Exception as err:
+                if isinstance(err, BatchSendError):
+                    batch = batch[err.sent:]
+                if attempt == self.max_retries:
+                    logger.error(f"Error sending {len(batch)} emails, giving up: {err}")
+                    return
+                delay = self.backoff * 2**attempt * random.uniform(0.5, 1.5)
+                logger.warning(f"Error sending {len(batch)} emails, retrying in {delay:.2f}s: {err}")
+                await asyncio.sleep(delay)
+
+
+dispatcher: Optional[NotificationDispatcher] = None
+
+
+def start_dispatcher() -> NotificationDispatcher:
+    global dispatcher
+    dispatcher = NotificationDispatcher(
+        get_transport(),
+        workers=settings.NOTIFICATION_WORKERS,
+        queue_size=settings.NOTIFICATION_QUEUE_SIZE,
+        batch_size=settings.NOTIFICATION_BATCH_SIZE,
+        max_retries=settings.NOTIFICATION_MAX_RETRIES,
+    )
+    dispatcher.start()
+    return dispatcher
+
+
+async def stop_dispatcher() -> None:
+    global dispatcher
+    if dispatcher is not None:
+        await dispatcher.stop()
+        dispatcher = None
+
+
+def send_email(to_email: str, subject: str, template_file: str, context: Optional[dict[str, Any]] = None) -> bool:
+    """Render ``template_file`` and queue the email; never waits on the transport."""
+    if dispatcher is None:
+        raise RuntimeError("Notification dispatcher is not running")
+    return dispatcher.send_email(to_email, subject, template_file, context)
@@ -0,0 +1,10 @@
+from typing import List
+
+from pydantic import BaseModel, EmailStr
+
+
+class EmailMessage(BaseModel):
+    sender: str
+    to: List[EmailStr]
+    subject: str
+    html: str
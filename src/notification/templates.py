@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from src.config import settings
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
+TEMPLATES_DIR = "templates"
+
+
+@lru_cache
+def get_environment() -> "Environment":
+    """
+    Process-wide Jinja2 environment, built on the first render so Jinja2 is
+    not imported at startup. Compiled templates stay cached; the template
+    files are only re-checked for changes in debug environments.
+    """
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(),
+        auto_reload=settings.ENVIRONMENT.is_debug,
+        cache_size=-1,
+    )
+
+
+def render(template_file: str, context: dict[str, Any]) -> str:
+    return get_environment().get_template(template_file).render(context)
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import logging
+import os
+import smtplib
+import uuid
+from email.message import EmailMessage as MIMEMessage
+from typing import Protocol
+
+from src.config import settings
+from src.notification.schema import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSendError(Exception):
+    """A batch failed after its first ``sent`` messages were delivered."""
+
+    def __init__(self, sent: int, error: Exception) -> None:
+        super().__init__(f"{error!r} after {sent} messages")
+        self.sent = sent
+
+
+class EmailTransport(Protocol):
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        """
+        Send ``messages`` in order. A transport that can fail part way raises
+        ``BatchSendError`` so that only the unsent messages are retried.
+        """
+        ...
+
+
+class ResendTransport:
+    """Sends through the Resend batch API in a worker thread."""
+
+    def __init__(self, api_key: str) -> None:
+        import resend
+
+        resend.api_key = api_key
+        self._resend = resend
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        params = [
+            {"from": m.sender, "to": m.to, "subject": m.subject, "html": m.html}
+            for m in messages
+        ]
+        await asyncio.to_thread(self._resend.Batch.send, params)
+
+
+class SMTPTransport:
+    """Sends a batch over one SMTP connection in a worker thread."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+
+    def _send(self, messages: list[EmailMessage]) -> None:
+        sent = 0
+        try:
+            with smtplib.SMTP(self.host, self.port) as smtp:
+                for message in messages:
+                    mime = MIMEMessage()
+                    mime["From"] = message.sender
+                    mime["To"] = ", ".join(message.to)
+                    mime["Subject"] = message.subject
+                    mime.set_content(message.html, subtype="html")
+                    smtp.send_message(mime)
+                    sent += 1
+        except Exception as ex:
+            if not sent:
+                raise
+            raise BatchSendError(sent, ex) from ex
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        await asyncio.to_thread(self._send, messages)
+
+
+class FileTransport:
+    """Writes each message as a JSON file, for local development and tests."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def _write(self, messages: list[EmailMessage]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        for sent, message in enumerate(messages):
+            path = os.path.join(self.directory, f"{uuid.uuid4()}.json")
+            try:
+                with open(path, "w") as f:
+                    json.dump(message.model_dump(), f)
+            except OSError as ex:
+                if not sent:
+                    raise
+                raise BatchSendError(sent, ex) from ex
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        await asyncio.to_thread(self._write, messages)
+
+
+def get_transport() -> EmailTransport:
+    if settings.EMAIL_TRANSPORT == "resend":
+        return ResendTransport(settings.RESEND_API_KEY)
+    if settings.EMAIL_TRANSPORT == "smtp":
+        return SMTPTransport(settings.SMTP_HOST, settings.SMTP_PORT)
+    return FileTransport(settings.EMAIL_OUTBOX_DIR)
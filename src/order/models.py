@@ -0,0 +1,153 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Collection
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    DECIMAL,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+    update,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, mapped_column, relationship
+
+from src.customer.models import Customer
+from src.models import Base
+from src.order.schema import Order as OrderSchema, OrderStatus, PaymentMethod
+
+# Ids per guarded UPDATE, well below the bind parameter limit of asyncpg.
+TRANSITION_BATCH_SIZE = 5000
+
+
+def _enum(enum_cls) -> Enum:
+    """Store the enum values ("Pending"), not the member names, as VARCHAR."""
+    return Enum(
+        enum_cls,
+        native_enum=False,
+        length=20,
+        values_callable=lambda members: [member.value for member in members],
+    )
+
+
+def allowed_source_statuses(new_status: OrderStatus) -> list[OrderStatus]:
+    """Statuses an order may move to ``new_status`` from, per ``validate_status_transition``."""
+    allowed = []
+    for old_status in OrderStatus:
+        if old_status == new_status:
+            continue
+        try:
+            OrderSchema.validate_status_transition(old_status, new_status)
+        except ValueError:
+            continue
+        allowed.append(old_status)
+    return allowed
+
+
+class Order(Base):
+    __tablename__ = 'orders'
+    __table_args__ = (
+        # Fulfilment dashboards filter by status and page by date.
+        Index("ix_orders_status_order_date", "status", "order_date"),
+    )
+
+    id = mapped_column(Integer, primary_key=True, autoincrement=True)
+    order_number = mapped_column(String(64), nullable=False, unique=True)
+    customer_id = mapped_column(Integer, ForeignKey('customers.id'), nullable=True)
+    customer = relationship(Customer)
+    order_date = mapped_column(DateTime, nullable=False, default=datetime.now)
+    status = mapped_column(_enum(OrderStatus), nullable=False, default=OrderStatus.PENDING)
+    payment_method = mapped_column(_enum(PaymentMethod), nullable=False)
+    # Kept equal to the sum of the line totals on every flush
+    total_amount = mapped_column(DECIMAL(12, 2), nullable=False, default=Decimal("0"))
+    note = mapped_column(String(500))
+    version = mapped_column(Integer, nullable=False)
+    items = relationship(
+        "OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="selectin"
+    )
+
+    # Every UPDATE checks and bumps the version; a stale copy fails with
+    # StaleDataError instead of overwriting a concurrent change.
+    __mapper_args__ = {"version_id_col": version}
+
+    def recalculate_total(self, removed: Collection["OrderItem"] = ()) -> None:
+        self.total_amount = sum(
+            (item.quantity * item.price_per_unit for item in self.items if item not in removed),
+            Decimal("0"),
+        )
+
+    @classmethod
+    async def transition_status(
+        cls, db: AsyncSession, ids: list[int], new_status: OrderStatus
+    ) -> list[int]:
+        """
+        Move the orders in ``ids`` to ``new_status`` with guarded
+        ``UPDATE ... WHERE status IN (...)`` statements and no row locks.
+
+        Orders whose current status may not change to ``new_status`` are left
+        untouched, as are orders already in it. Each updated row gets a new
+        version, so loaded copies of it fail on their next save.
+
+        :return: the ids that were transitioned
+        """
+        allowed = allowed_source_statuses(new_status)
+        if not ids or not allowed:
+            return []
+
+        transitioned = []
+        try:
+            for i in range(0, len(ids), TRANSITION_BATCH_SIZE):
+                stmt = (
+                    update(cls)
+                    .where(cls.id.in_(ids[i:i + TRANSITION_BATCH_SIZE]), cls.status.in_(allowed))
+                    .values(status=new_status, version=cls.version + 1)
+                    .returning(cls.id)
+                    .execution_options(synchronize_session=False)
+                )
+                transitioned.extend(await db.scalars(stmt))
+            await cls._commit(db, [])
+        except SQLAlchemyError as ex:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
+            ) from ex
+
+        return transitioned
+
+
+class OrderItem(Base):
+    __tablename__ = 'order_items'
+
+    id = mapped_column(Integer, primary_key=True, autoincrement=True)
+    order_id = mapped_column(Integer, ForeignKey('orders.id', ondelete="CASCADE"), nullable=False, index=True)
+    product_id = mapped_column(String(64), nullable=False)
+    name = mapped_column(String(255), nullable=False)
+    quantity = mapped_column(Integer, nullable=False)
+    price_per_unit = mapped_column(DECIMAL(10, 2), nullable=False)
+    order = relationship("Order", back_populates="items")
+
+
+@event.listens_for(Session, "before_flush")
+def _update_order_totals(session: Session, flush_context, instances) -> None:
+    """Recalculate the stored total of every order whose items changed in this flush."""
+    orders = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Order):
+            orders.add(instance)
+        elif isinstance(instance, OrderItem):
+            order = instance.order
+            if order is None and instance.order_id is not None:
+                # Added by foreign key only; link it so it counts in order.items.
+                order = session.get(Order, instance.order_id)
+                if order is not None and instance not in session.deleted:
+                    instance.order = order
+            if order is not None:
+                orders.add(order)
+    for order in orders:
+        if order not in session.deleted:
+            order.recalculate_total(removed=session.deleted)
@@ -3,7 +3,6 @@ from pydantic import BaseModel, EmailStr, Field, constr, condecimal, field_valid
 from enum import Enum
 from typing import List, Optional, Annotated
 from datetime import datetime
-from pydantic_extra_types.phone_numbers import PhoneNumber
 
 # ENUM  for Order Status
 class OrderStatus(str, Enum):
@@ -70,7 +69,7 @@ class Order(BaseModel):
 
     # Calculate the total amount for the order
     def calculate_total(self) -> None:
-        self.total_amount = sum([p.quantity * p.price_per_unit for p in self.products])
+        self.total_amount = sum(p.quantity * p.price_per_unit for p in self.products)
 
     # Custom validation for order status transitions
     @classmethod
@@ -0,0 +1,126 @@
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import PydanticCustomError, core_schema
+
+from src.config import settings
+
+DEFAULT_BIN_TABLE = Path(__file__).with_name("bin_ranges.json")
+UNKNOWN_BRAND = "Unknown"
+
+
+@dataclass(frozen=True, slots=True)
+class BinEntry:
+    brand: str
+    allowed: bool = True
+    reason: Optional[str] = None
+    lengths: Optional[frozenset[int]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class CardAnalysis:
+    brand: str
+    allowed: bool
+    reason: Optional[str]
+    masked: str
+
+
+class BinTable:
+    """
+    IIN prefix index. Each ``start``-``end`` range is expanded into its
+    fixed-width prefixes, so a lookup is one dict probe per distinct prefix
+    width, longest first; the most specific range wins.
+    """
+
+    def __init__(self, ranges: list[dict[str, Any]]) -> None:
+        self._prefixes: dict[str, BinEntry] = {}
+        for item in ranges:
+            start, end = item["start"], item["end"]
+            if len(start) != len(end) or int(start) > int(end):
+                raise ValueError(f"Invalid BIN range {start}-{end}")
+            entry = BinEntry(
+                brand=item["brand"],
+                allowed=item.get("allowed", True),
+                reason=item.get("reason"),
+                lengths=frozenset(item["lengths"]) if item.get("lengths") else None,
+            )
+            for prefix in range(int(start), int(end) + 1):
+                self._prefixes[str(prefix).zfill(len(start))] = entry
+        self._widths = sorted({len(p) for p in self._prefixes}, reverse=True)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "BinTable":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def lookup(self, card_number: str) -> Optional[BinEntry]:
+        for width in self._widths:
+            entry = self._prefixes.get(card_number[:width])
+            if entry is not None:
+                return entry
+        return None
+
+
+@lru_cache
+def get_bin_table() -> BinTable:
+    return BinTable.from_file(settings.CARD_BIN_TABLE or DEFAULT_BIN_TABLE)
+
+
+def _luhn_valid(card_number: str) -> bool:
+    total = 0
+    for i, digit in enumerate(reversed(card_number)):
+        n = ord(digit) - 48
+        if i % 2:
+            n = n * 2 - 9 if n > 4 else n * 2
+        total += n
+    return total % 10 == 0
+
+
+def analyze_card_number(card_number: str) -> CardAnalysis:
+    """Check the Luhn digit, then resolve brand, allow/deny and the masked form."""
+    if not _luhn_valid(card_number):
+        raise PydanticCustomError("payment_card_number_luhn", "Card number is not luhn valid")
+
+    entry = get_bin_table().lookup(card_number)
+    if entry is not None and entry.lengths and len(card_number) not in entry.lengths:
+        raise PydanticCustomError(
+            "payment_card_number_brand",
+            "Length for a {brand} card must be {lengths}",
+            {"brand": entry.brand, "lengths": " or ".join(map(str, sorted(entry.lengths)))},
+        )
+
+    return CardAnalysis(
+        brand=entry.brand if entry else UNKNOWN_BRAND,
+        allowed=entry.allowed if entry else True,
+        reason=entry.reason if entry else None,
+        masked=f"{card_number[:4]} **** **** {card_number[-4:]}",
+    )
+
+
+class CardNumber(str):
+    """
+    Card number validated in a single pass, carrying its ``CardAnalysis`` so
+    brand and masked form are computed once per request.
+    """
+
+    analysis: CardAnalysis
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: type[Any], handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_after_validator_function(
+            cls.validate,
+            core_schema.str_schema(min_length=12, max_length=19, strip_whitespace=True, pattern=r"^\d+$"),
+        )
+
+    @classmethod
+    def validate(cls, value: str) -> "CardNumber":
+        analysis = analyze_card_number(value)
+        if not analysis.allowed:
+            raise PydanticCustomError("card_number_error", analysis.reason or f"{analysis.brand} is not supported")
+        card_number = cls(value)
+        card_number.analysis = analysis
+        return card_number
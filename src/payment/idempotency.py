@@ -0,0 +1,323 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import redis as redis_store
+from src.config import settings
+from src.local_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+REDACTED = "[REDACTED]"
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {
+                "fingerprint": self.fingerprint,
+                "status": self.status,
+                "headers": self.headers,
+                "body": base64.b64encode(self.body).decode(),
+            }
+        )
+
+    @classmethod
+    def loads(cls, data: str | bytes) -> "StoredResponse":
+        raw = json.loads(data)
+        return cls(
+            fingerprint=raw["fingerprint"],
+            status=raw["status"],
+            headers=[tuple(h) for h in raw["headers"]],
+            body=base64.b64decode(raw["body"]),
+        )
+
+
+class IdempotencyStore(Protocol):
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        ...
+
+    async def acquire(self, key: str, ttl: int) -> bool:
+        """Claim ``key`` for processing; False if another request holds it."""
+        ...
+
+    async def save(self, key: str, response: StoredResponse, ttl: int) -> None:
+        ...
+
+    async def release(self, key: str) -> None:
+        ...
+
+
+class MemoryIdempotencyStore:
+    """
+    Per-process store for tests and single-worker deployments. It is
+    bounded to ``maxsize`` responses, and with several workers a retry that
+    reaches another worker is processed again.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self._responses = LRUCache(maxsize)
+        self._locks = LRUCache(maxsize)
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        return self._responses.get(key)
+
+    async def acquire(self, key: str, ttl: int) -> bool:
+        if self._locks.get(key) is not None:
+            return False
+        self._locks.set(key, True, ttl)
+        return True
+
+    async def save(self, key: str, response: StoredResponse, ttl: int) -> None:
+        self._responses.set(key, response, ttl)
+        self._locks.delete(key)
+
+    async def release(self, key: str) -> None:
+        self._locks.delete(key)
+
+
+class RedisIdempotencyStore:
+    """
+    Store shared by all workers; the in-flight claim is a ``SET NX EX`` lock.
+    While Redis is unavailable, or when a call fails, it falls back to a
+    per-process store.
+    """
+
+    prefix = "idempotency:"
+
+    def __init__(self) -> None:
+        self.fallback = MemoryIdempotencyStore()
+
+    async def _call(self, remote: Callable[[Redis], Awaitable[Any]], local: Callable[[], Awaitable[Any]]) -> Any:
+        client = redis_store.get_client()
+        if client is not None:
+            try:
+                result = await remote(client)
+                redis_store.breaker.record_success()
+                return result
+            except RedisError as ex:
+                logger.warning(f"Idempotency store call failed, using the local store: {ex!r}")
+                redis_store.breaker.record_failure()
+        return await local()
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        async def _remote(client: Redis) -> Optional[StoredResponse]:
+            data = await client.get(f"{self.prefix}{key}")
+            return StoredResponse.loads(data) if data else None
+
+        return await self._call(_remote, lambda: self.fallback.get(key))
+
+    async def acquire(self, key: str, ttl: int) -> bool:
+        async def _remote(client: Redis) -> bool:
+            return bool(await client.set(f"{self.prefix}lock:{key}", 1, nx=True, ex=ttl))
+
+        return await self._call(_remote, lambda: self.fallback.acquire(key, ttl))
+
+    async def save(self, key: str, response: StoredResponse, ttl: int) -> None:
+        async def _remote(client: Redis) -> None:
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.set(f"{self.prefix}{key}", response.dumps(), ex=ttl)
+                pipe.delete(f"{self.prefix}lock:{key}")
+                await pipe.execute()
+
+        await self._call(_remote, lambda: self.fallback.save(key, response, ttl))
+
+    async def release(self, key: str) -> None:
+        async def _remote(client: Redis) -> None:
+            await client.delete(f"{self.prefix}lock:{key}")
+
+        await self._call(_remote, lambda: self.fallback.release(key))
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    if settings.IDEMPOTENCY_BACKEND == "redis":
+        return RedisIdempotencyStore()
+    return MemoryIdempotencyStore()
+
+
+class IdempotencyMiddleware:
+    """
+    Serve retried ``POST`` requests carrying an ``Idempotency-Key`` header
+    from the stored response of the first attempt, without running the
+    route again. Concurrent duplicates wait for the first request instead of
+    being processed in parallel: in-process through a shared future, across
+    workers by polling the store while the first request holds the claim.
+    Server errors are not stored, so they can be retried, and JSON fields
+    named in ``redact_fields`` are stored and replayed as ``REDACTED``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        path_prefixes: tuple[str, ...] = ("/payment",),
+        ttl: int = 24 * 60 * 60,
+        lock_timeout: int = 30,
+        redact_fields: tuple[str, ...] = ("cvv",),
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.path_prefixes = path_prefixes
+        self.redact_fields = frozenset(redact_fields)
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = Headers(scope=scope).get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        fingerprint = hashlib.sha256(scope["path"].encode() + b"\0" + body).hexdigest()
+        key = f"{scope['path']}:{idempotency_key}"
+
+        stored = await self._resolve(key, scope, body, fingerprint)
+        if stored.fingerprint and stored.fingerprint != fingerprint:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key was already used with a different request"},
+                status_code=422,
+            )
+        else:
+            response = Response(stored.body, status_code=stored.status)
+            response.raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in stored.headers]
+        await response(scope, receive, send)
+
+    async def _resolve(self, key: str, scope: Scope, body: bytes, fingerprint: str) -> StoredResponse:
+        stored = await self.store.get(key)
+        if stored is not None:
+            return self._replayed(stored)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            return self._replayed(await asyncio.shield(future))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if await self.store.acquire(key, self.lock_timeout):
+                stored = await self._process(key, scope, body, fingerprint)
+            else:
+                stored = self._replayed(await self._wait_for(key))
+            future.set_result(stored)
+            return stored
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so waiter-less failures do not log warnings.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _process(self, key: str, scope: Scope, body: bytes, fingerprint: str) -> StoredResponse:
+        messages: list[Message] = []
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: Message) -> None:
+            messages.append(message)
+
+        try:
+            await self.app(scope, receive, send)
+        except BaseException:
+            await self.store.release(key)
+            raise
+
+        start = next(m for m in messages if m["type"] == "http.response.start")
+        stored = StoredResponse(
+            fingerprint=fingerprint,
+            status=start["status"],
+            headers=[(k.decode("latin-1"), v.decode("latin-1")) for k, v in start.get("headers", [])],
+            body=b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body"),
+        )
+        try:
+            if stored.status < 500:
+                await self.store.save(key, self._redacted(stored), self.ttl)
+            else:
+                await self.store.release(key)
+        except Exception as ex:
+            # The route has run; its response must reach the client anyway.
+            logger.error(f"Could not store the response for {key}: {ex!r}")
+        return stored
+
+    def _redacted(self, stored: StoredResponse) -> StoredResponse:
+        """``stored`` with the ``redact_fields`` of a JSON body replaced."""
+        headers = dict(stored.headers)
+        if not self.redact_fields or not headers.get("content-type", "").startswith("application/json"):
+            return stored
+        try:
+            body = json.dumps(self._redact(json.loads(stored.body)), separators=(",", ":")).encode()
+        except ValueError:
+            return stored
+        headers["content-length"] = str(len(body))
+        return replace(stored, headers=list(headers.items()), body=body)
+
+    def _redact(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: REDACTED if k in self.redact_fields else self._redact(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._redact(v) for v in value]
+        return value
+
+    async def _wait_for(self, key: str) -> StoredResponse:
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            stored = await self.store.get(key)
+            if stored is not None:
+                return stored
+        return StoredResponse(
+            fingerprint="",
+            status=409,
+            headers=[("content-type", "application/json")],
+            body=b'{"detail":"A request with this Idempotency-Key is still in progress"}',
+        )
+
+    @staticmethod
+    def _replayed(stored: StoredResponse) -> StoredResponse:
+        if not stored.fingerprint:
+            return stored
+        return StoredResponse(
+            fingerprint=stored.fingerprint,
+            status=stored.status,
+            headers=[*stored.headers, (REPLAYED_HEADER, "true")],
+            body=stored.body,
+        )
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
@@ -1,9 +1,9 @@
 import logging
 from uuid import uuid4
 from datetime import datetime
-from faker import Faker
 from fastapi import FastAPI, APIRouter, Depends, status, UploadFile, Request, HTTPException
 from src.payment.schema import PaymentRequest, PaymentResponse, TransactionStatus
+from src.responses import ModelJSONResponse
 
 router = APIRouter(prefix="/payment")
 
@@ -22,6 +22,7 @@ async def create_payment(request: Request, product: PaymentRequest):
     # Create the response
     payment_response = PaymentResponse(
         transaction_id=uuid4(),
+        amount=product.amount,
         card_brand=product.card_brand,
         cvv=product.cvv.get_secret_value(),
         masked_card_number=product.masked_card_number,
@@ -29,5 +30,5 @@ async def create_payment(request: Request, product: PaymentRequest):
         timestamp=datetime.now()
     )
 
-    return payment_response
+    return ModelJSONResponse(payment_response)
 
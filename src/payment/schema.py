@@ -1,10 +1,10 @@
-import re
 from datetime import datetime
 from enum import Enum
 from uuid import uuid4
-from pydantic import BaseModel, SecretStr, Field, field_validator, UUID4
-from pydantic_core import PydanticCustomError
-from pydantic_extra_types.payment import PaymentCardNumber
+from typing import Optional
+from pydantic import BaseModel, SecretStr, Field, UUID4
+
+from src.payment.card import CardNumber
 
 class TransactionStatus(Enum):
     PENDING = "Pending"
@@ -14,7 +14,7 @@ class TransactionStatus(Enum):
 
 
 class PaymentRequest(BaseModel):
-    card_number: PaymentCardNumber = Field(
+    card_number: CardNumber = Field(
         ...,
         example="4111111111111111 for Visa, 3566002020360505 for JCB",  # Example Visa card number
         description="Valid Visa card number"
@@ -22,38 +22,23 @@ class PaymentRequest(BaseModel):
     expiration_date: str 
     cvv: SecretStr
     cardholder_name: str 
-
-    @field_validator("card_number")
-    @classmethod
-    def validate_card_number(cls, value):
-        # Starts with 3528 - 3589
-        # Example: 3528 1234 5678 9010
-        if re.match(r'^(?:352[89]|35[3-8][0-9])\d{12}$', value):
-            raise PydanticCustomError('card_number_error', 'JCB is not supported')
-        return value
-
+    # Optional, so requests written against the original contract stay valid
+    amount: Optional[float] = Field(None, gt=0)
 
     @property
     def card_brand(self) -> str:
-        """Determine the card brand based on the card number."""
-        card_number = self.card_number
-        if card_number.startswith("4"):
-            return "VISA"
-        elif card_number.startswith("5"):
-            return "MasterCard"
-        else:
-            return "Unknown"
+        """Card brand resolved from the BIN table during validation."""
+        return self.card_number.analysis.brand
         
     @property
     def masked_card_number(self) -> str:
-        """Mask the card number, leaving only the first 4 and last 4 digits visible."""
-        card_number = str(self.card_number)
-        return f"{card_number[:4]} **** **** {card_number[-4:]}"
+        """The card number with only the first 4 and last 4 digits visible."""
+        return self.card_number.analysis.masked
 
 
 class PaymentResponse(BaseModel):
     transaction_id: UUID4
-    amount: float
+    amount: Optional[float] = None
     card_brand: str
     cvv: str
     masked_card_number: str
@@ -2,10 +2,13 @@ from src.models import Base
 from sqlalchemy import (
     Column,
     Boolean,
+    Computed,
     DateTime,
     DECIMAL,
+    Float,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -13,23 +16,118 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     UUID,
+    and_,
+    bindparam,
+    func,
+    or_,
     select
 )
-from sqlalchemy.orm import joinedload
-from typing import Any
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, insert
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, AsyncIterator, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from src.cache import Codec, query_key, read_through, statement_key
+from src.constants import UOW_DEPTH_KEY
+from src.database_replicas import read_primary
+from src.product.schemas import ProductCacheRecord
+from src.queries import register_query, run_query
+
+SEARCH_CONFIG = "english"
+# Weighted document behind full-text search; to_tsvector with an explicit
+# configuration is immutable, as a generated column requires.
+SEARCH_DOCUMENT = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(brand, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+
+
+async def _cached(database_session: AsyncSession, key: str, loader, tags, codec: Codec):
+    """
+    ``read_through`` for ``database_session``, refilled from the primary.
+    Inside a ``unit_of_work`` the session may see writes that are later
+    rolled back, so the cache is bypassed until the scope has committed.
+    """
+    if database_session.info.get(UOW_DEPTH_KEY):
+        return await loader()
+
+    async def _load_from_primary():
+        # A refill is served to every reader for CACHE_TTL, so it must not
+        # come from a replica that has not replayed the latest writes yet.
+        with read_primary(database_session):
+            return await loader()
+
+    return await read_through(key, _load_from_primary, tags, codec)
+
+
+def _cache_record(instance: Base, schema: type[BaseModel]) -> BaseModel:
+    """The attributes of ``instance`` that are loaded, as ``schema``; nothing is lazy loaded."""
+    loaded = inspect(instance).dict
+    return schema.model_validate(
+        {name: loaded[name] for name in schema.model_fields if name in loaded},
+        from_attributes=True,
+    )
+
+
+def _detached(cls: type[Base], values: dict[str, Any]) -> Base:
+    """A clean, detached ``cls`` instance holding ``values`` as if loaded from its row."""
+    instance = cls.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(instance, key, value)
+    make_transient_to_detached(instance)
+    return instance
+
+
+async def _attach(database_session: AsyncSession, instance: Optional[Base]) -> Optional[Base]:
+    """
+    Merge an instance served from the cache into ``database_session``, so
+    that changes made to it are flushed. Loaded instances are returned as is.
+    """
+    if instance is None:
+        return None
+    return await database_session.merge(instance, load=False)
+
 
 class Category(Base):
     __tablename__ = 'categories'
     
     id = mapped_column(Integer, primary_key=True, autoincrement=True)
-    name = mapped_column(String(100), nullable=False)
+    name = mapped_column(String(100), nullable=False, unique=True)
     description = mapped_column(String)
     products = relationship("Product", back_populates="category")
 
+    @classmethod
+    async def ids_by_name(cls, database_session: AsyncSession, names: set[str]) -> dict[str, int]:
+        """
+        Map category names to ids, creating the missing categories in one
+        ``INSERT ... ON CONFLICT (name) DO NOTHING``. Concurrent callers
+        creating the same name wait on each other's row instead of
+        duplicating it; names are inserted in order so they cannot deadlock.
+        """
+        if not names:
+            return {}
+        with read_primary(database_session):
+            _result = await database_session.execute(
+                insert(cls)
+                .values([{"name": name} for name in sorted(names)])
+                .on_conflict_do_nothing(index_elements=[cls.name])
+                .returning(cls.name, cls.id)
+            )
+            ids = dict(_result.all())
+            existing = names - ids.keys()
+            if existing:
+                _result = await database_session.execute(
+                    select(cls.name, cls.id).where(cls.name.in_(existing))
+                )
+                ids.update(_result.all())
+        return ids
+
 
 class Product(Base):
     __tablename__ = 'products'
@@ -38,20 +136,207 @@ class Product(Base):
     session_id = mapped_column(UUID)
     name = mapped_column(String(255))
     category_id = mapped_column(Integer, ForeignKey('categories.id'), nullable=True)
+    category = relationship("Category", back_populates="products")
     
+    description = mapped_column(Text)
+    price = mapped_column(DECIMAL(10, 2))
+    stock = mapped_column(Integer, default=0)
+    image = mapped_column(String(2048))
+    ratings = mapped_column(Float, default=0)
+    discount = mapped_column(Float, default=0)
+    manufacturer = mapped_column(String(255))
+    brand = mapped_column(String(255))
+    tags = mapped_column(ARRAY(String(100)), nullable=False, default=list, server_default="{}")
+    # Maintained by PostgreSQL; deferred so row loads do not carry it.
+    search_vector = mapped_column(TSVECTOR, Computed(SEARCH_DOCUMENT, persisted=True), deferred=True)
+
     created_at = mapped_column(DateTime, default=datetime.now)
     updated_at = mapped_column(DateTime, default=datetime.now, onupdate=datetime.now)
     is_active = mapped_column(Boolean, default=True)
+
+    __table_args__ = (
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # Typo-tolerant and prefix matching on the name (pg_trgm).
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index("ix_products_tags", "tags", postgresql_using="gin"),
+    )
     
     @classmethod
     async def find(cls, database_session: AsyncSession, where_conditions: list[Any]):
         _stmt = select(cls).where(*where_conditions)
-        _result = await database_session.execute(_stmt)
-        return _result.scalars().first()
+
+        async def _load():
+            _result = await database_session.execute(_stmt)
+            return _result.scalars().first()
+
+        def _tags(product):
+            # A miss may be satisfied by any new row, so tag it with the table.
+            if product is None:
+                return [cls.__tablename__]
+            return [f"{cls.__tablename__}:{product.id}"]
+
+        product = await _cached(
+            database_session, statement_key(cls.__tablename__, _stmt), _load, _tags, PRODUCT_CODEC
+        )
+        return await _attach(database_session, product)
     
+    @classmethod
+    async def get(cls, database_session: AsyncSession, product_id: int) -> Optional["Product"]:
+        """Fetch a product by id through the pre-built ``product_by_id`` query."""
+
+        async def _load():
+            _result = await run_query(database_session, "product_by_id", id=product_id)
+            return _result.scalars().first()
+
+        def _tags(product):
+            if product is None:
+                return [cls.__tablename__]
+            return [f"{cls.__tablename__}:{product.id}"]
+
+        product = await _cached(
+            database_session, query_key("product_by_id", id=product_id), _load, _tags, PRODUCT_CODEC
+        )
+        return await _attach(database_session, product)
+
     @classmethod
     async def find_all(cls, database_session: AsyncSession):
         _stmt = select(cls).options(joinedload(Product.category))
+
+        async def _load():
+            _result = await database_session.execute(_stmt)
+            return _result.scalars().all()
+
+        def _tags(products):
+            category_ids = {p.category_id for p in products if p.category_id is not None}
+            return [cls.__tablename__, *(f"{Category.__tablename__}:{i}" for i in category_ids)]
+
+        products = await _cached(
+            database_session, statement_key(cls.__tablename__, _stmt), _load, _tags, PRODUCTS_CODEC
+        )
+        return [await _attach(database_session, product) for product in products]
+
+
+    @classmethod
+    async def copy_records(cls, database_session: AsyncSession, rows: list[dict[str, Any]]) -> int:
+        """
+        Insert ``rows`` with a single COPY on the session's connection.
+
+        COPY bypasses ORM defaults, so every row must carry all of its values.
+        The caller owns the transaction.
+        """
+        if not rows:
+            return 0
+        columns = list(rows[0])
+        connection = await database_session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            cls.__tablename__,
+            records=[tuple(row[c] for c in columns) for row in rows],
+            columns=columns,
+        )
+        return len(rows)
+
+    @classmethod
+    async def find_page(
+        cls,
+        database_session: AsyncSession,
+        last_id: Optional[int] = None,
+        limit: int = 100,
+    ):
+        """Return up to ``limit`` products ordered by id, starting after ``last_id``."""
+        _stmt = select(cls).order_by(cls.id).limit(limit)
+        if last_id is not None:
+            _stmt = _stmt.where(cls.id > last_id)
         _result = await database_session.execute(_stmt)
         return _result.scalars().all()
 
+    @classmethod
+    async def stream_all(
+        cls, database_session: AsyncSession, batch_size: int = 1000
+    ) -> AsyncIterator[list["Product"]]:
+        """Yield products in batches from a server-side cursor."""
+        _stmt = select(cls).order_by(cls.id).execution_options(yield_per=batch_size)
+        _result = await database_session.stream(_stmt)
+        async for partition in _result.scalars().partitions():
+            yield partition
+            # Batches are never revisited, drop them from the identity map.
+            for product in partition:
+                database_session.expunge(product)
+
+    @classmethod
+    async def search(
+        cls,
+        database_session: AsyncSession,
+        query: str,
+        tags: Optional[list[str]] = None,
+        after: Optional[tuple[float, int]] = None,
+        limit: int = 20,
+    ) -> list[tuple["Product", float]]:
+        """
+        Rank active products matching ``query`` and carrying all of ``tags``.
+
+        A product matches on full text (``websearch_to_tsquery``), on a name
+        starting with ``query``, or on a name similar to it (pg_trgm), each
+        backed by a GIN index. Results are ordered by rank, then id, and
+        ``after`` is the ``(rank, id)`` of the last result of the previous
+        page.
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = (func.ts_rank_cd(cls.search_vector, ts_query) + func.similarity(cls.name, query)).label("rank")
+        prefix = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+        _stmt = (
+            select(cls, rank)
+            .where(
+                cls.is_active.is_not(False),
+                or_(
+                    cls.search_vector.op("@@")(ts_query),
+                    cls.name.ilike(prefix, escape="\\"),
+                    cls.name.op("%")(query),
+                ),
+            )
+            .order_by(rank.desc(), cls.id)
+            .limit(limit)
+        )
+        if tags:
+            _stmt = _stmt.where(cls.tags.contains(tags))
+        if after is not None:
+            last_rank, last_id = after
+            _stmt = _stmt.where(or_(rank < last_rank, and_(rank == last_rank, cls.id > last_id)))
+
+        _result = await database_session.execute(_stmt)
+        return [(product, score) for product, score in _result.all()]
+
+
+def _product_from_record(record: Optional[ProductCacheRecord]) -> Optional[Product]:
+    if record is None:
+        return None
+    values = record.model_dump(exclude_unset=True)
+    if "category" in values:
+        category = values["category"]
+        values["category"] = category and _detached(Category, category)
+    return _detached(Product, values)
+
+
+_product_adapter = TypeAdapter(Optional[ProductCacheRecord])
+_products_adapter = TypeAdapter(list[ProductCacheRecord])
+
+PRODUCT_CODEC = Codec(
+    dump=lambda product: _product_adapter.dump_json(
+        product and _cache_record(product, ProductCacheRecord), exclude_unset=True
+    ),
+    load=lambda data: _product_from_record(_product_adapter.validate_json(data)),
+)
+PRODUCTS_CODEC = Codec(
+    dump=lambda products: _products_adapter.dump_json(
+        [_cache_record(p, ProductCacheRecord) for p in products], exclude_unset=True
+    ),
+    load=lambda data: [_product_from_record(r) for r in _products_adapter.validate_json(data)],
+)
+
+register_query("product_by_id", select(Product).where(Product.id == bindparam("id")))
@@ -1,8 +1,31 @@
+import json
 from uuid import uuid4
 from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator
 
-from fastapi import APIRouter, Depends, Request, HTTPException
-from src.product.schemas import ProductRequest, ProductResponse
+from asyncpg import InterfaceError, PostgresError
+from fastapi import APIRouter, Depends, Query, Request, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import invalidate_tags
+from src.database import AsyncSessionFactory, get_db
+from src.exceptions import BadRequest
+from src.product.models import Category, Product
+from src.responses import ModelJSONResponse
+from src.product.schemas import (
+    BulkProductResponse,
+    BulkRowError,
+    ProductPage,
+    ProductRecord,
+    ProductRequest,
+    ProductResponse,
+    ProductSearchHit,
+    ProductSearchPage,
+)
 # from faker import Faker
 # from sqlalchemy.ext.asyncio import AsyncSession
 # from sqlalchemy.orm import joinedload
@@ -10,6 +33,13 @@ from src.product.schemas import ProductRequest, ProductResponse
 
 router = APIRouter(prefix="")
 
+BULK_CHUNK_SIZE = 5000
+# COPY goes through the asyncpg connection, so it raises driver errors.
+BULK_INSERT_ERRORS = (SQLAlchemyError, PostgresError, InterfaceError)
+
+_product_adapter = TypeAdapter(ProductRequest)
+_product_list_adapter = TypeAdapter(list[ProductRequest])
+
 
 @router.post("/product", response_model=ProductResponse)
 async def create_product(request: Request, product: ProductRequest):
@@ -19,5 +49,218 @@ async def create_product(request: Request, product: ProductRequest):
         id=uuid4(),
         created_at=datetime.now(),
     )
-    return product_response
-    
\ No newline at end of file
+    return ModelJSONResponse(product_response)
+
+
+@router.get("/products", response_model=ProductPage)
+async def list_products(
+    after: int | None = Query(None, description="Id of the last product of the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    products = await Product.find_page(db, last_id=after, limit=limit)
+    return ModelJSONResponse(ProductPage(
+        items=[ProductRecord.model_validate(p) for p in products],
+        next_cursor=products[-1].id if len(products) == limit else None,
+    ))
+
+
+def _parse_search_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        rank, last_id = cursor.split(":")
+        return float(rank), int(last_id)
+    except ValueError:
+        raise BadRequest()
+
+
+@router.get("/products/search", response_model=ProductSearchPage)
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=200),
+    tags: list[str] = Query([], description="Only products carrying all of these tags"),
+    after: str | None = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    hits = await Product.search(
+        db,
+        q,
+        tags=tags,
+        after=_parse_search_cursor(after) if after else None,
+        limit=limit,
+    )
+    items = [
+        ProductSearchHit(**ProductRecord.model_validate(p).model_dump(), rank=rank)
+        for p, rank in hits
+    ]
+    return ModelJSONResponse(ProductSearchPage(
+        items=items,
+        next_cursor=f"{hits[-1][1]!r}:{hits[-1][0].id}" if len(hits) == limit else None,
+    ))
+
+
+@router.get("/products/export")
+async def export_products(
+    batch_size: int = Query(1000, ge=1, le=10_000),
+):
+    # The session must outlive the handler, so it is owned by the generator.
+    async def _ndjson():
+        async with AsyncSessionFactory() as db:
+            async for batch in Product.stream_all(db, batch_size=batch_size):
+                yield b"".join(
+                    ProductRecord.model_validate(p).model_dump_json().encode() + b"\n"
+                    for p in batch
+                )
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
+
+async def _ndjson_chunks(request: Request) -> AsyncIterator[list[bytes]]:
+    buffer = b""
+    lines: list[bytes] = []
+    async for data in request.stream():
+        buffer += data
+        *complete, buffer = buffer.split(b"\n")
+        lines.extend(line for line in complete if line.strip())
+        while len(lines) >= BULK_CHUNK_SIZE:
+            yield lines[:BULK_CHUNK_SIZE]
+            lines = lines[BULK_CHUNK_SIZE:]
+    if buffer.strip():
+        lines.append(buffer)
+    if lines:
+        yield lines
+
+
+def _collect_errors(exc: ValidationError, offset: int) -> dict[int, list[dict[str, Any]]]:
+    by_row: dict[int, list[dict[str, Any]]] = {}
+    for error in exc.errors(include_url=False, include_context=False):
+        index, *loc = error["loc"]
+        by_row.setdefault(offset + index, []).append({**error, "loc": tuple(loc)})
+    return by_row
+
+
+def _validate_json_lines(lines: list[bytes], offset: int):
+    """Validate NDJSON lines as one JSON array, falling back per line on syntax errors."""
+    try:
+        return list(enumerate(_product_list_adapter.validate_json(b"[" + b",".join(lines) + b"]"), offset)), {}
+    except ValidationError as exc:
+        if any(e["type"] != "json_invalid" for e in exc.errors()):
+            rows = [json.loads(line) for line in lines]
+            return _validate_rows(rows, offset)
+
+    valid, errors = [], {}
+    for index, line in enumerate(lines, offset):
+        try:
+            valid.append((index, _product_adapter.validate_json(line)))
+        except ValidationError as exc:
+            errors[index] = exc.errors(include_url=False, include_context=False)
+    return valid, errors
+
+
+def _validate_rows(rows: list[Any], offset: int):
+    """Validate a chunk in one pass; rows with errors are reported and dropped."""
+    try:
+        return list(enumerate(_product_list_adapter.validate_python(rows), offset)), {}
+    except ValidationError as exc:
+        errors = _collect_errors(exc, offset)
+    remaining = [(i, row) for i, row in enumerate(rows, offset) if i not in errors]
+    products = _product_list_adapter.validate_python([row for _, row in remaining])
+    return [(i, p) for (i, _), p in zip(remaining, products)], errors
+
+
+async def _insert_chunk(
+    db: AsyncSession, valid: list[tuple[int, ProductRequest]]
+) -> tuple[int, dict[int, list[dict[str, Any]]]]:
+    """
+    Write a validated chunk in one COPY and one commit. If the database
+    rejects it, the chunk is rolled back and each of its rows reported.
+    """
+    products = [p for _, p in valid]
+    try:
+        return await _copy_products(db, products), {}
+    except BULK_INSERT_ERRORS as ex:
+        await db.rollback()
+        error = {"type": "database_error", "loc": (), "msg": str(ex)}
+        return 0, {index: [error] for index, _ in valid}
+
+
+async def _copy_products(db: AsyncSession, products: list[ProductRequest]) -> int:
+    category_ids = await Category.ids_by_name(db, {p.category for p in products})
+    now = datetime.now()
+    inserted = await Product.copy_records(
+        db,
+        [
+            {
+                "session_id": None,
+                "name": p.name,
+                "category_id": category_ids[p.category],
+                "description": p.description,
+                "price": Decimal(str(p.price)),
+                "stock": p.stock,
+                "image": str(p.image),
+                "ratings": p.ratings,
+                "discount": p.discount,
+                "manufacturer": p.manufacturer,
+                "brand": p.brand,
+                "tags": p.tags,
+                "created_at": now,
+                "updated_at": now,
+                "is_active": p.availability,
+            }
+            for p in products
+        ],
+    )
+    await db.commit()
+    return inserted
+
+
+@router.post("/products/bulk", response_model=BulkProductResponse)
+async def bulk_create_products(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Ingest a JSON array or an NDJSON stream (``application/x-ndjson``) of
+    ``ProductRequest`` rows. Rows are validated and written per chunk of
+    ``BULK_CHUNK_SIZE``, each chunk in one COPY and one commit; invalid rows
+    and the rows of chunks the database rejects are reported by their index
+    and skipped.
+    """
+    inserted = 0
+    errors: dict[int, list[dict[str, Any]]] = {}
+    offset = 0
+
+    async def _insert(valid):
+        nonlocal inserted
+        chunk_inserted, chunk_errors = await _insert_chunk(db, valid)
+        inserted += chunk_inserted
+        errors.update(chunk_errors)
+
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            async for lines in _ndjson_chunks(request):
+                valid, chunk_errors = _validate_json_lines(lines, offset)
+                errors.update(chunk_errors)
+                if valid:
+                    await _insert(valid)
+                offset += len(lines)
+        else:
+            try:
+                rows = json.loads(await request.body())
+            except json.JSONDecodeError:
+                raise BadRequest()
+            if not isinstance(rows, list):
+                raise BadRequest()
+            for offset in range(0, len(rows), BULK_CHUNK_SIZE):
+                valid, chunk_errors = _validate_rows(rows[offset:offset + BULK_CHUNK_SIZE], offset)
+                errors.update(chunk_errors)
+                if valid:
+                    await _insert(valid)
+    finally:
+        # Chunks are committed one by one, so invalidate whatever was
+        # committed even if a later chunk failed the request.
+        if inserted:
+            await invalidate_tags([Product.__tablename__])
+
+    return ModelJSONResponse(BulkProductResponse(
+        inserted=inserted,
+        failed=len(errors),
+        errors=[BulkRowError(index=i, errors=e) for i, e in sorted(errors.items())],
+    ))
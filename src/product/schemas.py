@@ -1,29 +1,112 @@
 import re
 from datetime import datetime
-from pydantic import EmailStr, Field, field_validator, HttpUrl, UUID4
+from decimal import Decimal
+from uuid import UUID
+from pydantic import EmailStr, Field, field_validator, HttpUrl, UrlConstraints, UUID4
 
 STRONG_PASSWORD_PATTERN = re.compile(r"^(?=.*[\d])(?=.*[!@#$%^&*])[\w!@#$%^&*]{6,128}$")
 
 from pydantic import BaseModel, ConfigDict, model_validator
-from typing import List, Optional
+from typing import Annotated, Any, List, Optional
+
+# Column limits of the products and categories tables, checked before COPY
+# so an oversized value is reported as a row error, not a driver error.
+INT4_MAX = 2**31 - 1
+Tag = Annotated[str, Field(max_length=100)]
+
 
 class ProductRequest(BaseModel):
-    name: str
+    name: str = Field(max_length=255)
     description: str
-    price: float
-    category: str
-    stock: int
+    # DECIMAL(10, 2)
+    price: float = Field(gt=-10**8, lt=10**8)
+    category: str = Field(max_length=100)
+    stock: int = Field(ge=-INT4_MAX - 1, le=INT4_MAX)
     availability: bool
-    image: HttpUrl
+    image: Annotated[HttpUrl, UrlConstraints(max_length=2048)]
     ratings: Optional[float] = 0
     discount: Optional[float] = 0
-    manufacturer: Optional[str] = None
-    brand: Optional[str] = None
-    tags: List[str] = []
+    manufacturer: Optional[str] = Field(None, max_length=255)
+    brand: Optional[str] = Field(None, max_length=255)
+    tags: List[Tag] = []
 
 
 # Pydantic model for Product (Response Model)
 class ProductResponse(ProductRequest):
     id: UUID4
     created_at: datetime
-    updated_at: Optional[datetime] = None
\ No newline at end of file
+    updated_at: Optional[datetime] = None
+
+
+# Row shape of the ORM Product used by listing and export endpoints
+class ProductRecord(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: Optional[str] = None
+    category_id: Optional[int] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    brand: Optional[str] = None
+    tags: Optional[List[str]] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class CategoryCacheRecord(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str] = None
+
+
+# Every column of the ORM Product, the form in which products are cached;
+# only the attributes that were loaded are set.
+class ProductCacheRecord(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    session_id: Optional[UUID] = None
+    name: Optional[str] = None
+    category_id: Optional[int] = None
+    category: Optional[CategoryCacheRecord] = None
+    description: Optional[str] = None
+    price: Optional[Decimal] = None
+    stock: Optional[int] = None
+    image: Optional[str] = None
+    ratings: Optional[float] = None
+    discount: Optional[float] = None
+    manufacturer: Optional[str] = None
+    brand: Optional[str] = None
+    tags: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    is_active: Optional[bool] = None
+
+
+class ProductPage(BaseModel):
+    items: List[ProductRecord]
+    next_cursor: Optional[int] = None
+
+
+class ProductSearchHit(ProductRecord):
+    rank: float
+
+
+class ProductSearchPage(BaseModel):
+    items: List[ProductSearchHit]
+    # "<rank>:<id>" of the last hit, to pass as ``after`` for the next page
+    next_cursor: Optional[str] = None
+
+
+class BulkRowError(BaseModel):
+    index: int
+    errors: List[dict[str, Any]]
+
+
+class BulkProductResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkRowError] = []
\ No newline at end of file
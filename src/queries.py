@@ -0,0 +1,90 @@
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import Executable, Result, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.util import LRUCache
+
+from src.config import settings
+from src.metrics import registry
+
+compiled_cache_hits = registry.counter("db_compiled_cache_hits_total", "Statements found in the compiled cache")
+compiled_cache_misses = registry.counter("db_compiled_cache_misses_total", "Statements compiled on execution")
+prepared_cache_hits = registry.counter("db_prepared_statement_cache_hits_total", "Executions reusing a prepared statement")
+prepared_cache_misses = registry.counter("db_prepared_statement_cache_misses_total", "Statements prepared on execution")
+
+# Named statements, built once with bindparam() placeholders (or as
+# lambda_stmt()), so executing them skips statement construction and
+# cache key generation and always hits the compiled cache.
+QUERIES: dict[str, Executable] = {}
+
+
+def register_query(name: str, stmt: Executable) -> Executable:
+    QUERIES[name] = stmt
+    return stmt
+
+
+async def run_query(db: AsyncSession, name: str, **params: Any) -> Result:
+    return await db.execute(QUERIES[name], params)
+
+
+def statement_cache_args(url: str) -> dict[str, Any]:
+    """
+    asyncpg ``connect_args`` for the prepared statement cache. Behind
+    PgBouncer in transaction mode a prepared statement may not exist on the
+    next transaction's server connection, so caching is disabled and every
+    statement gets a unique name.
+    """
+    if make_url(url).get_driver_name() != "asyncpg":
+        return {}
+    if settings.DATABASE_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE}
+
+
+class _CountingLRUCache(LRUCache):
+    """The per-connection prepared statement cache, counting lookups."""
+
+    def __contains__(self, key: object) -> bool:
+        found = super().__contains__(key)
+        (prepared_cache_hits if found else prepared_cache_misses).inc()
+        return found
+
+
+_compiled_caches: list[LRUCache] = []
+
+
+def instrument_statement_caches(engine: AsyncEngine) -> None:
+    """Count compiled cache and prepared statement cache hits for ``engine``."""
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        if context.cache_hit is CacheStats.CACHE_HIT:
+            compiled_cache_hits.inc()
+        elif context.cache_hit is CacheStats.CACHE_MISS:
+            compiled_cache_misses.inc()
+
+    @event.listens_for(engine.sync_engine.pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cache = getattr(dbapi_connection, "_prepared_statement_cache", None)
+        if cache is not None:
+            counting = _CountingLRUCache(cache.capacity, cache.threshold)
+            dbapi_connection._prepared_statement_cache = counting
+
+    compiled_cache = engine.sync_engine._compiled_cache
+    if compiled_cache is not None:
+        if not _compiled_caches:
+            registry.gauge(
+                "db_compiled_cache_size",
+                "Statements in the compiled caches of all engines",
+                lambda: sum(len(cache) for cache in _compiled_caches),
+            )
+        _compiled_caches.append(compiled_cache)
@@ -0,0 +1,150 @@
+import logging
+import re
+import statistics
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import APIRouter
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("src.slow_query")
+
+router = APIRouter(prefix="/debug")
+
+SAMPLES_PER_FINGERPRINT = 1000
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"(?:\$\d+|%\(\w+\)s|(?<!:):\w+|\?)(?:::\w+)?")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Normalize ``statement`` so queries differing only in values share a key."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class FingerprintStats:
+    count: int = 0
+    total: float = 0.0
+    samples: deque = field(default_factory=lambda: deque(maxlen=SAMPLES_PER_FINGERPRINT))
+
+    def record(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.samples.append(elapsed)
+
+    def percentiles(self) -> dict[str, float]:
+        if len(self.samples) < 2:
+            value = self.samples[0] if self.samples else 0.0
+            return {"p50": value, "p95": value, "p99": value}
+        cuts = statistics.quantiles(self.samples, n=100)
+        return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+@dataclass
+class RequestQueryStats:
+    count: int = 0
+    total: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def n_plus_one(self) -> list[str]:
+        return [fp for fp, n in self.fingerprints.items() if n > settings.N_PLUS_ONE_THRESHOLD]
+
+
+fingerprint_stats: dict[str, FingerprintStats] = {}
+_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is dropped with a failed
+    # statement, so a failure cannot shift the timings that follow it.
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start_time
+    key = fingerprint(statement)
+    fingerprint_stats.setdefault(key, FingerprintStats()).record(elapsed)
+
+    request_stats = _request_stats.get()
+    if request_stats is not None:
+        request_stats.count += 1
+        request_stats.total += elapsed
+        request_stats.fingerprints[key] += 1
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        slow_query_logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {key}")
+
+
+def install(engine: AsyncEngine) -> None:
+    """Attach the profiling listeners to ``engine``."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryProfilerMiddleware:
+    """
+    Collect per-request query stats and log N+1 patterns. In debug
+    environments the totals are also returned as ``X-DB-*`` response headers.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.ENVIRONMENT.is_debug:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Query-Time-Ms"] = f"{stats.total * 1000:.2f}"
+                if stats.n_plus_one():
+                    headers["X-DB-N-Plus-One"] = str(len(stats.n_plus_one()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            for key in stats.n_plus_one():
+                logger.warning(
+                    f"Possible N+1 on {scope['path']}: {stats.fingerprints[key]} x {key}"
+                )
+
+
+@router.get("/queries", include_in_schema=False)
+async def query_stats(limit: int = 50) -> list[dict]:
+    ranked = sorted(fingerprint_stats.items(), key=lambda item: item[1].total, reverse=True)
+    return [
+        {
+            "fingerprint": key,
+            "count": stats.count,
+            "total_ms": stats.total * 1000,
+            **{name: value * 1000 for name, value in stats.percentiles().items()},
+        }
+        for key, stats in ranked[:limit]
+    ]
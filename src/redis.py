@@ -1,31 +1,332 @@
+import asyncio
+import contextlib
+import logging
+import time
+import weakref
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Optional
+from typing import Any, Awaitable, Callable, Iterable, Optional, Sequence
 
-from redis.asyncio import Redis
+from redis.asyncio import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
 
-from src.models import CustomModel
+from src.config import settings
+from src.local_cache import LRUCache
+from src.metrics import registry
+
+logger = logging.getLogger(__name__)
 
 redis_client: Redis = None  # type: ignore
+redis_pool: Optional[ConnectionPool] = None
+_health_task: Optional[asyncio.Task] = None
+
+# Keys per pipeline/MGET/UNLINK round trip.
+BATCH_SIZE = 1000
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures and lets requests
+    through again once ``reset_timeout`` seconds have passed.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("Redis is reachable again, closing circuit breaker")
+            # Entries written during the outage may be stale now.
+            local_cache.clear()
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold and self.state != "open":
+            self.trip()
 
+    def trip(self) -> None:
+        logger.warning(f"Opening Redis circuit breaker after {self.failures} failures")
+        self.opened_at = time.monotonic()
 
-class RedisData(CustomModel):
+
+breaker = CircuitBreaker(settings.REDIS_BREAKER_FAILURES, settings.REDIS_BREAKER_RESET)
+# Serves the key/value helpers while Redis is unconfigured or unreachable.
+local_cache = LRUCache(settings.REDIS_LOCAL_CACHE_SIZE)
+
+
+@dataclass(slots=True)
+class RedisData:
     key: bytes | str
     value: bytes | str
     ttl: Optional[int | timedelta] = None
 
 
-async def set_redis_key(redis_data: RedisData, *, is_transaction: bool = False) -> None:
-    async with redis_client.pipeline(transaction=is_transaction) as pipe:
-        await pipe.set(redis_data.key, redis_data.value)
-        if redis_data.ttl:
-            await pipe.expire(redis_data.key, redis_data.ttl)
+def get_client() -> Optional[Redis]:
+    """The Redis client, or ``None`` while Redis is unconfigured or the breaker is open."""
+    if redis_client is None or not breaker.allow_request():
+        return None
+    return redis_client
+
+
+async def init_redis() -> None:
+    global redis_client, redis_pool, _health_task
+    if not settings.REDIS_URL:
+        logger.info("REDIS_URL is not set, using the in-process cache only")
+        return
+
+    redis_pool = ConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    )
+    redis_client = Redis(connection_pool=redis_pool)
+    try:
+        await redis_client.ping()
+    except RedisError as ex:
+        logger.warning(f"Redis is unreachable at startup: {ex!r}")
+        breaker.record_failure()
+    _health_task = asyncio.create_task(_health_check())
+
 
-        await pipe.execute()
+async def close_redis() -> None:
+    global redis_client, redis_pool, _health_task
+    if _health_task is not None:
+        _health_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _health_task
+        _health_task = None
+    if redis_client is not None:
+        await redis_client.aclose()
+        await redis_pool.disconnect()
+    redis_client = None
+    redis_pool = None
+
+
+async def _health_check() -> None:
+    """Ping Redis periodically; reconnect with exponential backoff while it is down."""
+    backoff = settings.REDIS_HEALTH_CHECK_INTERVAL
+    while True:
+        await asyncio.sleep(backoff)
+        try:
+            await redis_client.ping()
+            breaker.record_success()
+            backoff = settings.REDIS_HEALTH_CHECK_INTERVAL
+        except RedisError as ex:
+            breaker.failures += 1
+            breaker.trip()
+            logger.warning(f"Redis health check failed, retrying in {backoff}s: {ex!r}")
+            await redis_pool.disconnect(inuse_connections=False)
+            backoff = min(backoff * 2, settings.REDIS_MAX_RECONNECT_BACKOFF)
+
+
+def redis_stats() -> dict[str, Any]:
+    stats = {
+        "breaker": breaker.state,
+        "failures": breaker.failures,
+        "local_cache_size": len(local_cache),
+    }
+    if redis_pool is not None:
+        stats.update(
+            max_connections=redis_pool.max_connections,
+            idle_connections=len(redis_pool._available_connections),
+            in_use_connections=len(redis_pool._in_use_connections),
+        )
+    return stats
+
+
+registry.gauge("redis_breaker_open", "1 while the Redis circuit breaker is open", lambda: int(breaker.state == "open"))
+registry.gauge("redis_pool_in_use", "Redis connections in use", lambda: redis_stats().get("in_use_connections", 0))
+registry.gauge("redis_pool_idle", "Idle Redis connections", lambda: redis_stats().get("idle_connections", 0))
+registry.gauge("redis_local_cache_size", "Entries in the local fallback cache", lambda: len(local_cache))
+
+
+async def _with_fallback(remote: Callable[[Redis], Awaitable[Any]], local: Callable[[], Any]) -> Any:
+    client = get_client()
+    if client is not None:
+        try:
+            result = await remote(client)
+            breaker.record_success()
+            return result
+        except RedisError as ex:
+            logger.warning(f"Redis call failed, using local cache: {ex!r}")
+            breaker.record_failure()
+    return local()
+
+
+def _seconds(ttl: Optional[int | timedelta]) -> Optional[float]:
+    return ttl.total_seconds() if isinstance(ttl, timedelta) else ttl
+
+
+def _chunks(items: Sequence[Any], size: int = BATCH_SIZE) -> Iterable[Sequence[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def set_redis_key(redis_data: RedisData, *, is_transaction: bool = False) -> None:
+    # A single SET ... EX is atomic, is_transaction is kept for callers.
+    await _with_fallback(
+        # A falsy ttl means no expiry; Redis rejects EX 0.
+        lambda client: client.set(redis_data.key, redis_data.value, ex=redis_data.ttl or None),
+        lambda: local_cache.set(redis_data.key, redis_data.value, _seconds(redis_data.ttl)),
+    )
 
 
 async def get_by_key(key: str) -> Optional[str]:
-    return await redis_client.get(key)
+    return await _with_fallback(lambda client: client.get(key), lambda: local_cache.get(key))
 
 
 async def delete_by_key(key: str) -> None:
-    return await redis_client.delete(key)
+    return await _with_fallback(lambda client: client.delete(key), lambda: local_cache.delete(key))
+
+
+async def set_many(records: Sequence[RedisData], *, is_transaction: bool = False) -> None:
+    """Write ``records`` with their own TTLs, one pipeline per ``BATCH_SIZE`` keys."""
+
+    async def _remote(client: Redis) -> None:
+        for chunk in _chunks(records):
+            async with client.pipeline(transaction=is_transaction) as pipe:
+                for record in chunk:
+                    pipe.set(record.key, record.value, ex=record.ttl or None)
+                await pipe.execute()
+
+    def _local() -> None:
+        for record in records:
+            local_cache.set(record.key, record.value, _seconds(record.ttl))
+
+    await _with_fallback(_remote, _local)
+
+
+async def get_many(keys: Sequence[str]) -> list[Optional[bytes | str]]:
+    """Values for ``keys`` in order, ``None`` for missing keys."""
+
+    async def _remote(client: Redis) -> list[Optional[bytes | str]]:
+        values = []
+        for chunk in _chunks(keys):
+            values.extend(await client.mget(chunk))
+        return values
+
+    return await _with_fallback(_remote, lambda: [local_cache.get(key) for key in keys])
+
+
+async def unlink(client: Redis, keys: Sequence[str]) -> int:
+    """Remove ``keys`` with UNLINK, which frees memory off the Redis main thread; errors propagate."""
+    deleted = 0
+    for chunk in _chunks(keys):
+        deleted += await client.unlink(*chunk)
+    return deleted
+
+
+async def delete_many(keys: Sequence[str]) -> int:
+    """``unlink`` ``keys``, from the local cache while Redis is unavailable."""
+    return await _with_fallback(
+        lambda client: unlink(client, keys),
+        lambda: sum(local_cache.delete(key) for key in keys),
+    )
+
+
+async def expire_many(keys: Sequence[str], ttl: int | timedelta) -> None:
+    async def _remote(client: Redis) -> None:
+        for chunk in _chunks(keys):
+            async with client.pipeline(transaction=False) as pipe:
+                for key in chunk:
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+
+    def _local() -> None:
+        for key in keys:
+            value = local_cache.get(key)
+            if value is not None:
+                local_cache.set(key, value, _seconds(ttl))
+
+    await _with_fallback(_remote, _local)
+
+
+# Lua scripts run atomically on the server; they are loaded once per client
+# and called by SHA afterwards. Keyed by the client itself, not its id(),
+# which a client created after close_redis may reuse.
+SCRIPTS: dict[str, str] = {}
+_loaded_scripts: "weakref.WeakKeyDictionary[Redis, dict[str, AsyncScript]]" = weakref.WeakKeyDictionary()
+
+
+def register_script(name: str, source: str) -> None:
+    SCRIPTS[name] = source
+
+
+async def run_script(client: Redis, name: str, keys: Sequence[str] = (), args: Sequence[Any] = ()) -> Any:
+    scripts = _loaded_scripts.setdefault(client, {})
+    script = scripts.get(name)
+    if script is None:
+        script = scripts[name] = client.register_script(SCRIPTS[name])
+    return await script(keys=keys, args=args)
+
+
+register_script(
+    "compare_and_set",
+    """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        if tonumber(ARGV[3]) > 0 then
+            redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+        else
+            redis.call('SET', KEYS[1], ARGV[2], 'KEEPTTL')
+        end
+        return 1
+    end
+    return 0
+    """,
+)
+
+register_script(
+    "compare_and_delete",
+    """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('UNLINK', KEYS[1])
+    end
+    return 0
+    """,
+)
+
+
+async def compare_and_set(key: str, expected: str, value: str, ttl: int = 0) -> bool:
+    """Set ``key`` to ``value`` only if it currently holds ``expected``."""
+
+    def _local() -> bool:
+        if local_cache.get(key) != expected:
+            return False
+        local_cache.set(key, value, ttl or None)
+        return True
+
+    return bool(await _with_fallback(
+        lambda client: run_script(client, "compare_and_set", keys=[key], args=[expected, value, ttl]),
+        _local,
+    ))
+
+
+async def compare_and_delete(key: str, expected: str) -> bool:
+    """Delete ``key`` only if it still holds ``expected``, e.g. to release an owned lock."""
+
+    def _local() -> bool:
+        return local_cache.get(key) == expected and local_cache.delete(key)
+
+    return bool(await _with_fallback(
+        lambda client: run_script(client, "compare_and_delete", keys=[key], args=[expected]),
+        _local,
+    ))
@@ -0,0 +1,18 @@
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core in a single pass.
+
+    Pydantic models (including lists and dicts of them) are serialized with
+    their own serializers, so ``CustomModel`` keeps its GMT datetime format.
+    Return it directly from a route to skip FastAPI's ``response_model``
+    validation and ``jsonable_encoder`` walk.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
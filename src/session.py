@@ -0,0 +1,181 @@
+import json
+import re
+import secrets
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Optional, Protocol
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection, cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import redis as redis_store
+from src.config import settings
+from src.local_cache import LRUCache
+
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{43}$")
+
+
+class SessionStore(Protocol):
+    async def load(self, session_id: str) -> Optional[dict[str, Any]]:
+        ...
+
+    async def save(self, session_id: str, data: dict[str, Any], ttl: int) -> None:
+        ...
+
+    async def delete(self, session_id: str) -> None:
+        ...
+
+
+class MemorySessionStore:
+    """Per-process store for tests and single-worker deployments."""
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self._sessions = LRUCache(maxsize)
+
+    async def load(self, session_id: str) -> Optional[dict[str, Any]]:
+        data = self._sessions.get(session_id)
+        return json.loads(data) if data else None
+
+    async def save(self, session_id: str, data: dict[str, Any], ttl: int) -> None:
+        self._sessions.set(session_id, json.dumps(data), ttl)
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.delete(session_id)
+
+
+class RedisSessionStore:
+    """Store shared by all workers, one JSON value per session with the session TTL."""
+
+    prefix = "session:"
+
+    async def load(self, session_id: str) -> Optional[dict[str, Any]]:
+        data = await redis_store.get_by_key(f"{self.prefix}{session_id}")
+        return json.loads(data) if data else None
+
+    async def save(self, session_id: str, data: dict[str, Any], ttl: int) -> None:
+        await redis_store.set_redis_key(
+            redis_store.RedisData(key=f"{self.prefix}{session_id}", value=json.dumps(data), ttl=ttl)
+        )
+
+    async def delete(self, session_id: str) -> None:
+        await redis_store.delete_by_key(f"{self.prefix}{session_id}")
+
+
+def get_session_store() -> SessionStore:
+    if settings.SESSION_BACKEND == "redis":
+        return RedisSessionStore()
+    return MemorySessionStore()
+
+
+class ServerSession(MutableMapping):
+    """
+    Session data behind an opaque id. The middleware loads it before the
+    handler runs, so it is used synchronously as ``request.session``, and
+    only writes it back when it was modified.
+    """
+
+    def __init__(self, session_id: Optional[str], store: SessionStore) -> None:
+        self.session_id = session_id
+        self.store = store
+        self.loaded = session_id is None
+        self.dirty = False
+        self._data: dict[str, Any] = {}
+
+    async def load(self) -> "ServerSession":
+        if not self.loaded:
+            data = await self.store.load(self.session_id)
+            if data is None:
+                # Unknown or expired id: never adopt an id chosen by the
+                # client, a new one is issued when the session is saved.
+                self.session_id = None
+            self._data = data or {}
+            self.loaded = True
+        return self
+
+    def _require_loaded(self) -> dict[str, Any]:
+        if not self.loaded:
+            raise RuntimeError("Session is not loaded, use `await load_session(request)`")
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._require_loaded()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._require_loaded()[key] = value
+        self.dirty = True
+
+    def __delitem__(self, key: str) -> None:
+        del self._require_loaded()[key]
+        self.dirty = True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._require_loaded())
+
+    def __len__(self) -> int:
+        return len(self._require_loaded())
+
+
+async def load_session(connection: HTTPConnection) -> ServerSession:
+    """``connection.session``; loaded already on paths the middleware serves."""
+    return await connection.session.load()
+
+
+class ServerSessionMiddleware:
+    """
+    Server-side sessions replacing Starlette's signed-cookie sessions. The
+    cookie only carries a random session id. Requests under
+    ``excluded_paths`` get no session at all; the others read the store
+    once before the handler, only if they carry a session cookie, and write
+    it only if the handler modified the session.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: SessionStore,
+        cookie_name: str = "session_id",
+        max_age: int = 14 * 24 * 60 * 60,
+        excluded_paths: tuple[str, ...] = (),
+        https_only: bool = False,
+        same_site: str = "lax",
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.cookie_name = cookie_name
+        self.max_age = max_age
+        self.excluded_paths = excluded_paths
+        self.security_flags = f"httponly; samesite={same_site}" + ("; secure" if https_only else "")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        session_id = None
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                session_id = cookie_parser(value.decode("latin-1")).get(self.cookie_name)
+                break
+        if session_id is not None and not SESSION_ID_PATTERN.match(session_id):
+            session_id = None
+
+        session = await ServerSession(session_id, self.store).load()
+        scope["session"] = session
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and session.dirty:
+                cookie = await self._save(session)
+                MutableHeaders(scope=message).append("Set-Cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _save(self, session: ServerSession) -> str:
+        if not session:
+            if session.session_id is not None:
+                await self.store.delete(session.session_id)
+            return f"{self.cookie_name}=null; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT; {self.security_flags}"
+
+        session.session_id = session.session_id or secrets.token_urlsafe(32)
+        await self.store.save(session.session_id, dict(session), self.max_age)
+        return f"{self.cookie_name}={session.session_id}; path=/; Max-Age={self.max_age}; {self.security_flags}"
@@ -4,9 +4,6 @@ import string
 from decimal import Decimal
 
 from fastapi import Request
-from jinja2 import Environment, FileSystemLoader
-
-from src.__config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -28,39 +25,6 @@ def get_flash_message(request: Request):
 def get_presigned_url():
     pass
 
-# def send_email(to_email: str, subject: str, template_file: str, context: dict = {}) -> object:
-#     try:
-#         template_loader = FileSystemLoader('templates')
-#         template_env = Environment(loader=template_loader)
-#         template = template_env.get_template(template_file)
-#         html_content = template.render(context)
-#     except Exception as err:
-#         logger.error(f'Error loading or rendering template: {err}')
-#         raise
-
-#     # Configure Resend
-#     try:
-#         resend.api_key = settings.RESEND_API_KEY
-#     except AttributeError as err:
-#         logger.error(f"API Key configuration error: {err}")
-#         raise
-
-#     # Prepare email parameters
-#     params = {
-#         "from": "Info <info@ibupedia.com>",
-#         "to": [to_email],
-#         "subject": subject,
-#         "html": html_content
-#     }
-
-#     # Send the email
-#     try:
-#         response = resend.Emails.send(params)
-#         logger.info(f'Email sent successfully to {to_email}. Response: {response}')
-#     except Exception as err:
-#         logger.error(f'Error sending email: {err}')
-#         raise
-
 
 def convert_decimal_to_cents(amount: Decimal) -> int:
     # Ensure the amount is rounded to 2 decimal places and converted to integer cents
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from src import redis as redis_store
+from src.config import settings
+from src.database import engine
+from src.payment.card import get_bin_table
+from src.payment.schema import PaymentRequest
+from src.product.schemas import ProductRequest
+
+logger = logging.getLogger(__name__)
+
+
+async def _open_db_connections(count: int) -> None:
+    """Check out ``count`` connections at once so they stay pooled afterwards."""
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(count)))
+
+
+async def _open_redis_connections(count: int) -> None:
+    client = redis_store.get_client()
+    if client is not None:
+        await asyncio.gather(*(client.ping() for _ in range(count)))
+
+
+# One valid payload per request model; validating it runs every validator
+# once, including the BIN lookup and URL parsing.
+SAMPLE_PRODUCT = {
+    "name": "Warm-up",
+    "description": "",
+    "price": 1.0,
+    "category": "warm-up",
+    "stock": 0,
+    "availability": False,
+    "image": "https://example.com/warm-up.png",
+    "tags": ["warm-up"],
+}
+SAMPLE_PAYMENT = {
+    "card_number": "4111111111111111",
+    "expiration_date": "12/30",
+    "cvv": "123",
+    "cardholder_name": "Warm Up",
+}
+
+
+def _build_validators() -> None:
+    configure_mappers()
+    get_bin_table()
+    ProductRequest.model_validate(SAMPLE_PRODUCT)
+    PaymentRequest.model_validate(SAMPLE_PAYMENT)
+
+
+async def warm_up() -> None:
+    """
+    Prime the worker before it accepts traffic: open pooled DB and Redis
+    connections and build lazily created validators and lookup tables.
+    Failures are logged, not raised; the worker then starts cold.
+    """
+    started = time.perf_counter()
+    try:
+        _build_validators()
+    except Exception as ex:
+        logger.warning(f"Building validators failed: {ex!r}")
+
+    db_connections = min(settings.WARMUP_DB_CONNECTIONS, settings.DATABASE_POOL_SIZE)
+    redis_connections = min(settings.WARMUP_REDIS_CONNECTIONS, settings.REDIS_MAX_CONNECTIONS)
+    for name, warm in (
+        ("database", _open_db_connections(db_connections)),
+        ("redis", _open_redis_connections(redis_connections)),
+    ):
+        try:
+            await asyncio.wait_for(warm, settings.WARMUP_TIMEOUT)
+        except Exception as ex:
+            logger.warning(f"Warming up the {name} pool failed: {ex!r}")
+
+    logger.info(f"Worker warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
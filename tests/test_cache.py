@@ -0,0 +1,99 @@
+import json
+import pickle
+import sqlite3
+from decimal import Decimal
+
+import pytest
+from redis.exceptions import ConnectionError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src import cache
+from src import redis as redis_store
+from src.cache import invalidate_tags
+from src.product.models import Product
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def products(tmp_path):
+    """A SQLite database holding products 1 and 2, with the columns Product selects."""
+    path = tmp_path / "products.db"
+    columns = ", ".join(c.name for c in Product.__table__.columns if c.name not in ("id", "search_vector"))
+    with sqlite3.connect(path) as conn:
+        conn.execute(f"CREATE TABLE products (id INTEGER PRIMARY KEY, {columns})")
+        conn.executemany(
+            "INSERT INTO products (id, name, price) VALUES (?, ?, ?)",
+            [(1, "Lamp", 19.9), (2, "Desk", 120)],
+        )
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def redis(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(redis_store, "redis_client", client)
+    monkeypatch.setattr(redis_store, "breaker", redis_store.CircuitBreaker(100, 10))
+    monkeypatch.setattr(cache, "_stale", False)
+    monkeypatch.setattr(cache, "stats", cache.CacheStats())
+    cache.l1.clear()
+    yield client
+    cache.l1.clear()
+    await client.aclose()
+
+
+async def find(session_factory, product_id):
+    async with session_factory() as db:
+        product = await Product.find(db, [Product.id == product_id])
+        assert product in db
+        return product
+
+
+async def cached_keys(client):
+    return [key async for key in client.scan_iter(match=f"{cache.CACHE_PREFIX}*")]
+
+
+async def test_products_are_cached_as_json(products, redis):
+    first = await find(products, 1)
+    cache.l1.clear()
+    second = await find(products, 1)
+
+    assert cache.stats.hits == 1
+    assert (second.id, second.name, second.price) == (1, "Lamp", Decimal("19.90"))
+    [key] = await cached_keys(redis)
+    assert json.loads(await redis.get(key))["name"] == first.name
+
+
+async def test_undecodable_entries_are_refilled(products, redis):
+    await find(products, 1)
+    [key] = await cached_keys(redis)
+    await redis.set(key, pickle.dumps({"name": "Injected"}))
+    cache.l1.clear()
+
+    product = await find(products, 1)
+
+    assert product.name == "Lamp"
+    assert json.loads(await redis.get(key))["name"] == "Lamp"
+
+
+async def test_missed_invalidation_flushes_the_namespace(products, redis):
+    await find(products, 1)
+    await find(products, 2)
+
+    async def _unlink(*keys):
+        raise ConnectionError("down")
+
+    redis.unlink = _unlink
+    await invalidate_tags(["products:1"])
+    assert cache._stale
+    del redis.unlink
+
+    await find(products, 2)
+
+    assert not cache._stale
+    assert cache.stats.misses == 3
+    assert len(await cached_keys(redis)) == 1
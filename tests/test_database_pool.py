@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database_pool import InstrumentedQueuePool, primary_metrics
+
+pytestmark = pytest.mark.anyio
+
+
+def counts():
+    return primary_metrics.checkout_timeouts.value, primary_metrics.checkout_errors.value
+
+
+async def test_exhausted_pool_counts_a_timeout(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    timeouts, errors = counts()
+    async with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+    await engine.dispose()
+
+    assert counts() == (timeouts + 1, errors)
+
+
+async def test_failed_connect_is_not_a_timeout(tmp_path):
+    async def _refuse():
+        raise ConnectionRefusedError("connection refused")
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        async_creator=_refuse,
+    )
+    timeouts, errors = counts()
+    with pytest.raises(ConnectionRefusedError):
+        async with engine.connect():
+            pass
+    await engine.dispose()
+
+    assert counts() == (timeouts, errors + 1)
@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import column, insert, select, table, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src import database_replicas
+from src.database import unit_of_work
+from src.database_pool import replica_metrics
+from src.database_replicas import LAG_QUERIES, Replica, RoutingSession, read_primary
+
+pytestmark = pytest.mark.anyio
+
+items = table("items", column("name"))
+
+
+@pytest.fixture
+async def databases(tmp_path, monkeypatch):
+    """A primary and one replica, as SQLite files that each hold a row naming them."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = Replica(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "primary"), (replica.engine, "replica")):
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE items (name VARCHAR)"))
+            await conn.execute(insert(items).values(name=name))
+    monkeypatch.setattr(database_replicas, "replicas", [replica])
+
+    yield async_sessionmaker(primary, expire_on_commit=False, sync_session_class=RoutingSession), replica
+
+    await primary.dispose()
+    await replica.engine.dispose()
+
+
+async def read_names(session):
+    return (await session.scalars(select(items.c.name))).all()
+
+
+async def test_select_reads_from_the_replica(databases):
+    session_factory, _ = databases
+    async with session_factory() as session:
+        assert await read_names(session) == ["replica"]
+
+
+async def test_select_for_update_reads_from_the_primary(databases):
+    session_factory, _ = databases
+    async with session_factory() as session:
+        assert (await session.scalars(select(items.c.name).with_for_update())).all() == ["primary"]
+
+
+async def test_session_reads_its_own_writes(databases):
+    session_factory, _ = databases
+    async with session_factory() as session:
+        await session.execute(insert(items).values(name="written"))
+        await session.commit()
+        assert await read_names(session) == ["primary", "written"]
+
+    async with session_factory() as session:
+        assert await read_names(session) == ["replica"]
+
+
+async def test_read_primary_routes_the_block_to_the_primary(databases):
+    session_factory, _ = databases
+    async with session_factory() as session:
+        with read_primary(session):
+            assert await read_names(session) == ["primary"]
+        assert await read_names(session) == ["replica"]
+
+
+async def test_write_inside_read_primary_stays_on_the_primary(databases):
+    session_factory, _ = databases
+    async with session_factory() as session:
+        with read_primary(session):
+            await session.execute(insert(items).values(name="written"))
+        await session.commit()
+        assert await read_names(session) == ["primary", "written"]
+
+
+async def test_unit_of_work_reads_from_the_primary(databases):
+    session_factory, _ = databases
+    async with session_factory() as session:
+        async with unit_of_work(session):
+            assert await read_names(session) == ["primary"]
+        assert await read_names(session) == ["replica"]
+
+
+async def test_lagging_replica_is_skipped_until_it_catches_up(databases, monkeypatch):
+    session_factory, replica = databases
+    monkeypatch.setitem(LAG_QUERIES, "sqlite", "SELECT 600")
+    await replica.check()
+    assert not replica.healthy
+    async with session_factory() as session:
+        assert await read_names(session) == ["primary"]
+
+    monkeypatch.delitem(LAG_QUERIES, "sqlite")
+    await replica.check()
+    assert replica.healthy
+    async with session_factory() as session:
+        assert await read_names(session) == ["replica"]
+
+
+async def test_replica_pools_are_instrumented(databases):
+    _, replica = databases
+    async with replica.engine.connect():
+        pass
+    assert replica.engine in replica_metrics.engines
+    assert replica_metrics.connections_opened.value > 0
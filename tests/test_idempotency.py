@@ -0,0 +1,103 @@
+import httpx
+import pytest
+from redis.exceptions import ConnectionError
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src import redis as redis_store
+from src.payment.idempotency import (
+    REDACTED,
+    IdempotencyMiddleware,
+    MemoryIdempotencyStore,
+    RedisIdempotencyStore,
+    StoredResponse,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class BrokenRedis:
+    """A client whose every command, including pipelines, fails."""
+
+    def __getattr__(self, name):
+        if name == "pipeline":
+            raise ConnectionError("down")
+
+        async def _command(*args, **kwargs):
+            raise ConnectionError("down")
+
+        return _command
+
+
+@pytest.fixture
+def broken_redis(monkeypatch):
+    monkeypatch.setattr(redis_store, "redis_client", BrokenRedis())
+    monkeypatch.setattr(redis_store, "breaker", redis_store.CircuitBreaker(100, 10))
+    return redis_store.breaker
+
+
+def payment_app(store, calls):
+    async def pay(request):
+        calls.append(1)
+        return JSONResponse({"amount": 5, "cvv": "123"})
+
+    app = Starlette(routes=[Route("/payment/card", pay, methods=["POST"])])
+    return IdempotencyMiddleware(app, store=store)
+
+
+async def post_twice(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        headers = {"Idempotency-Key": "key-1"}
+        first = await client.post("/payment/card", content=b"{}", headers=headers)
+        second = await client.post("/payment/card", content=b"{}", headers=headers)
+    return first, second
+
+
+async def test_memory_store_is_bounded():
+    store = MemoryIdempotencyStore(maxsize=3)
+    for i in range(10):
+        await store.save(str(i), StoredResponse("f", 200, [], b""), 60)
+    assert len(store._responses) == 3
+    assert await store.get("0") is None
+    assert await store.get("9") is not None
+
+
+async def test_memory_store_claims_once():
+    store = MemoryIdempotencyStore()
+    assert await store.acquire("k", 30)
+    assert not await store.acquire("k", 30)
+    await store.release("k")
+    assert await store.acquire("k", 30)
+
+
+async def test_retry_is_replayed_with_redacted_fields():
+    calls = []
+    first, second = await post_twice(payment_app(MemoryIdempotencyStore(), calls))
+
+    assert len(calls) == 1
+    assert first.json()["cvv"] == "123"
+    assert second.json() == {"amount": 5, "cvv": REDACTED}
+    assert second.headers["idempotent-replayed"] == "true"
+
+
+async def test_redis_failures_fall_back_to_the_local_store(broken_redis):
+    calls = []
+    first, second = await post_twice(payment_app(RedisIdempotencyStore(), calls))
+
+    assert first.status_code == second.status_code == 200
+    assert len(calls) == 1
+    assert broken_redis.failures > 0
+
+
+async def test_response_is_returned_when_saving_fails():
+    class FailingStore(MemoryIdempotencyStore):
+        async def save(self, key, response, ttl):
+            raise RuntimeError("store unavailable")
+
+    app = payment_app(FailingStore(), [])
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/payment/card", content=b"{}", headers={"Idempotency-Key": "key-1"})
+
+    assert response.status_code == 200
+    assert response.json()["cvv"] == "123"
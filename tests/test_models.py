@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from src.models import CustomModel
+
+NOW = datetime(2026, 10, 18, 12, 30, 15, 123456)
+
+
+class Event(CustomModel):
+    at: datetime
+    until: "datetime | None" = None
+    seen: Optional[datetime] = None
+    count: int = 0
+
+
+class NamedEvent(Event):
+    name: str = ""
+    renamed: datetime | None = None
+
+
+def test_datetimes_lose_their_microseconds():
+    event = Event(at=NOW, until=NOW, seen=NOW)
+
+    assert event.at == event.until == event.seen == NOW.replace(microsecond=0)
+
+
+def test_subclass_fields_lose_their_microseconds():
+    event = NamedEvent.model_validate_json('{"at": "2026-10-18T12:30:15.5", "renamed": "2026-10-18T12:30:15.5"}')
+
+    assert event.at == event.renamed == NOW.replace(microsecond=0)
+    assert event.until is None
@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm.exc import StaleDataError
+
+from src.models import Base
+from src.order.models import Order, OrderItem
+from src.order.schema import OrderStatus, PaymentMethod
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'orders.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[Base.metadata.tables[name] for name in ("customers", "orders", "order_items")],
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def create_order(session_factory, number, status=OrderStatus.PENDING):
+    async with session_factory() as db:
+        order = Order(order_number=number, status=status, payment_method=PaymentMethod.PAYPAL)
+        db.add(order)
+        await db.commit()
+        return order.id
+
+
+def item(order_id=None, quantity=1, price="10.00"):
+    return OrderItem(
+        order_id=order_id, product_id="p", name="Lamp", quantity=quantity, price_per_unit=Decimal(price)
+    )
+
+
+async def test_disallowed_transitions_are_skipped(sessions):
+    pending = await create_order(sessions, "A-1")
+    canceled = await create_order(sessions, "A-2", OrderStatus.CANCELED)
+    delivered = await create_order(sessions, "A-3", OrderStatus.DELIVERED)
+
+    async with sessions() as db:
+        transitioned = await Order.transition_status(db, [pending, canceled, delivered], OrderStatus.SHIPPED)
+
+    assert transitioned == [pending]
+    async with sessions() as db:
+        assert (await db.get(Order, canceled)).status == OrderStatus.CANCELED
+        assert (await db.get(Order, delivered)).status == OrderStatus.DELIVERED
+        assert (await db.get(Order, pending)).status == OrderStatus.SHIPPED
+
+
+async def test_transition_conflicts_with_a_loaded_copy(sessions):
+    order_id = await create_order(sessions, "B-1")
+
+    async with sessions() as db:
+        order = await db.get(Order, order_id)
+        async with sessions() as other:
+            assert await Order.transition_status(other, [order_id], OrderStatus.CONFIRMED) == [order_id]
+
+        order.note = "leave at the door"
+        with pytest.raises(StaleDataError):
+            await db.commit()
+
+
+async def test_total_counts_items_added_by_order_id(sessions):
+    order_id = await create_order(sessions, "C-1")
+
+    async with sessions() as db:
+        db.add_all([item(order_id, quantity=2), item(order_id, price="2.50")])
+        await db.commit()
+
+    async with sessions() as db:
+        order = await db.get(Order, order_id)
+        assert order.total_amount == Decimal("22.50")
+
+        order.items.append(item(quantity=3, price="1.00"))
+        await db.delete(next(i for i in order.items if i.quantity == 2))
+        await db.commit()
+
+    async with sessions() as db:
+        assert (await db.get(Order, order_id)).total_amount == Decimal("5.50")
@@ -0,0 +1,98 @@
+import json
+
+import httpx
+import pytest
+from asyncpg import PostgresError
+from fastapi import FastAPI
+
+from src.database import get_db
+from src.product import router as product_router
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def bulk(monkeypatch):
+    """POSTs to /products/bulk; COPY is replaced by a recorder that rejects rows named "reject"."""
+    db = FakeSession()
+    copied = []
+
+    async def _copy_products(session, products):
+        assert session is db
+        if any(p.name == "reject" for p in products):
+            raise PostgresError("value too long")
+        copied.extend(p.name for p in products)
+        return len(products)
+
+    monkeypatch.setattr(product_router, "_copy_products", _copy_products)
+    app = FastAPI()
+    app.include_router(product_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+
+    async def _post(content, content_type="application/json"):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/products/bulk", content=content, headers={"content-type": content_type})
+        return response, db, copied
+
+    return _post
+
+
+def product(name):
+    return {
+        "name": name,
+        "description": "",
+        "price": 9.5,
+        "category": "lamps",
+        "stock": 1,
+        "availability": True,
+        "image": "https://example.com/lamp.png",
+    }
+
+
+def error_types(body):
+    return {e["index"]: [error["type"] for error in e["errors"]] for e in body["errors"]}
+
+
+async def test_bad_ndjson_line_is_reported(bulk):
+    lines = [json.dumps(product("a")), '{"name": "b",', json.dumps(product("c"))]
+    response, _, copied = await bulk("\n".join(lines).encode(), "application/x-ndjson")
+
+    assert response.status_code == 200
+    assert copied == ["a", "c"]
+    assert response.json()["inserted"] == 2
+    assert error_types(response.json()) == {1: ["json_invalid"]}
+
+
+async def test_invalid_rows_are_reported_and_skipped(bulk):
+    rows = [product("a"), {**product("b"), "stock": 2**31}, {**product("c"), "image": "not a url"}]
+    response, _, copied = await bulk(json.dumps(rows).encode())
+
+    assert copied == ["a"]
+    assert response.json()["failed"] == 2
+    assert error_types(response.json()) == {1: ["less_than_equal"], 2: ["url_parsing"]}
+
+
+async def test_rejected_chunk_is_rolled_back(bulk, monkeypatch):
+    monkeypatch.setattr(product_router, "BULK_CHUNK_SIZE", 2)
+    rows = [product("a"), product("b"), product("reject"), product("d"), product("e")]
+    response, db, copied = await bulk(json.dumps(rows).encode())
+
+    assert db.rollbacks == 1
+    assert copied == ["a", "b", "e"]
+    assert response.json()["inserted"] == 3
+    assert error_types(response.json()) == {2: ["database_error"], 3: ["database_error"]}
+
+
+async def test_body_that_is_not_a_list_is_rejected(bulk):
+    response, _, copied = await bulk(b'{"name": "a"}')
+
+    assert response.status_code == 400
+    assert copied == []
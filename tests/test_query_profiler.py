@@ -0,0 +1,28 @@
+import time
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src import query_profiler
+from src.query_profiler import fingerprint
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_failed_statement_does_not_shift_later_timings(tmp_path, monkeypatch):
+    monkeypatch.setattr(query_profiler, "fingerprint_stats", {})
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profiled.db'}")
+    query_profiler.install(engine)
+
+    async with engine.connect() as conn:
+        with pytest.raises(exc.OperationalError):
+            await conn.execute(text("SELECT * FROM missing"))
+        assert not conn.info.get("query_start_time")
+        time.sleep(0.2)
+        await conn.execute(text("SELECT 1"))
+    await engine.dispose()
+
+    stats = query_profiler.fingerprint_stats[fingerprint("SELECT 1")]
+    assert stats.count == 1
+    assert stats.total < 0.1
@@ -0,0 +1,39 @@
+import pytest
+
+from src import redis as redis_store
+from src.redis import RedisData, compare_and_set, get_by_key, set_redis_key
+
+fakeredis = pytest.importorskip("fakeredis")
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def redis(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(redis_store, "redis_client", client)
+    monkeypatch.setattr(redis_store, "breaker", redis_store.CircuitBreaker(1, 10))
+    yield client
+    await client.aclose()
+
+
+async def test_zero_ttl_means_no_expiry(redis):
+    await set_redis_key(RedisData(key="k", value="v", ttl=0))
+
+    assert redis_store.breaker.failures == 0
+    assert await redis.ttl("k") == -1
+    assert await get_by_key("k") == b"v"
+
+
+async def test_scripts_are_loaded_per_client(redis, monkeypatch):
+    await redis.set("k", "a")
+    assert await compare_and_set("k", "a", "b")
+
+    replacement = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(redis_store, "redis_client", replacement)
+    await replacement.set("k", "b")
+    assert await compare_and_set("k", "b", "c")
+
+    assert redis_store._loaded_scripts[redis] is not redis_store._loaded_scripts[replacement]
+    assert redis_store.breaker.failures == 0
+    await replacement.aclose()
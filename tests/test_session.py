@@ -0,0 +1,117 @@
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.session import MemorySessionStore, ServerSessionMiddleware, load_session
+from src.utils import get_flash_message, set_flash_message
+
+pytestmark = pytest.mark.anyio
+
+UNKNOWN_ID = "A" * 43
+
+
+class RecordingStore(MemorySessionStore):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    async def load(self, session_id):
+        self.calls.append("load")
+        return await super().load(session_id)
+
+    async def save(self, session_id, data, ttl):
+        self.calls.append("save")
+        await super().save(session_id, data, ttl)
+
+    async def delete(self, session_id):
+        self.calls.append("delete")
+        await super().delete(session_id)
+
+
+async def login(request):
+    request.session["user"] = "alice"
+    set_flash_message(request, "Welcome back", "info")
+    return JSONResponse({})
+
+
+async def whoami(request):
+    session = await load_session(request)
+    return JSONResponse({"user": session.get("user"), "flash": get_flash_message(request)})
+
+
+async def logout(request):
+    request.session.clear()
+    return JSONResponse({})
+
+
+async def untouched(request):
+    return JSONResponse({})
+
+
+@pytest.fixture
+def store():
+    return RecordingStore()
+
+
+@pytest.fixture
+async def client(store):
+    app = Starlette(
+        routes=[
+            Route("/login", login, methods=["POST"]),
+            Route("/logout", logout, methods=["POST"]),
+            Route("/whoami", whoami),
+            Route("/untouched", untouched),
+            Route("/health", untouched),
+        ]
+    )
+    app = ServerSessionMiddleware(app, store=store, excluded_paths=("/health",))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def test_session_round_trip(client, store):
+    response = await client.post("/login")
+    session_id = response.cookies["session_id"]
+
+    assert len(session_id) == 43
+    assert (await client.get("/whoami")).json()["flash"] == {"message": "Welcome back", "category": "info"}
+    assert (await client.get("/whoami")).json() == {"user": "alice", "flash": None}
+
+
+async def test_unmodified_session_sets_no_cookie(client):
+    assert "set-cookie" not in (await client.get("/untouched")).headers
+    assert "set-cookie" not in (await client.get("/whoami")).headers
+
+
+async def test_request_without_cookie_skips_the_store(client, store):
+    await client.get("/whoami")
+    assert store.calls == []
+
+
+async def test_unknown_session_id_is_not_adopted(client, store):
+    client.cookies.set("session_id", UNKNOWN_ID)
+    response = await client.post("/login")
+
+    session_id = response.cookies["session_id"]
+    assert session_id != UNKNOWN_ID
+    assert await store.load(UNKNOWN_ID) is None
+    assert (await store.load(session_id))["user"] == "alice"
+
+
+async def test_emptied_session_is_deleted(client, store):
+    session_id = (await client.post("/login")).cookies["session_id"]
+    response = await client.post("/logout")
+
+    assert "expires=Thu, 01 Jan 1970" in response.headers["set-cookie"]
+    assert await store.load(session_id) is None
+
+
+async def test_excluded_paths_get_no_session(client, store):
+    client.cookies.set("session_id", UNKNOWN_ID)
+    response = await client.get("/health")
+
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+    assert store.calls == []